@@ -1,18 +1,39 @@
+import time
+STARTUP_TIME = time.perf_counter()
+
 import sys
 import os
 import random
-import time
 from PyQt6.QtWidgets import (
     QApplication, QGraphicsScene, QGraphicsView, QGraphicsRectItem,
     QVBoxLayout, QWidget, QSlider, QPushButton, QHBoxLayout,
-    QLabel, QComboBox, QLineEdit, QFileDialog, QCheckBox, QGroupBox
+    QLabel, QComboBox, QLineEdit, QCheckBox, QGroupBox, QProgressBar, QGridLayout
 )
-from PyQt6.QtCore import QTimer, QRectF, Qt
-from PyQt6.QtGui import QIcon, QPainter, QColor, QPen, QFont
-from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
+from PyQt6.QtCore import QEvent, QTimer, QRectF, QPointF, Qt
+from PyQt6.QtGui import QIcon, QPainter, QColor, QPen, QPolygonF
 
 from sortAlgorithms import *
 
+# The benchmark window (QtCharts), file dialogs and the benchmark engine are
+# imported on first use to keep them off the startup path.
+
+# Startup timing, printed with --startup-report or SORTIFY_STARTUP_REPORT=1
+startup_marks = []
+
+def mark_startup(label):
+    startup_marks.append((label, time.perf_counter()))
+
+def startup_report_requested():
+    return "--startup-report" in sys.argv or os.environ.get("SORTIFY_STARTUP_REPORT") == "1"
+
+def print_startup_report():
+    build = "bundled" if hasattr(sys, '_MEIPASS') else "source"
+    print(f"Startup report ({build} build, times since SortingApp started):")
+    for label, timestamp in startup_marks:
+        print(f"  {label:<14}{(timestamp - STARTUP_TIME) * 1000:9.1f} ms")
+
+mark_startup("imports")
+
 # Get absolute path to resource, works for PyInstaller and development.
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
@@ -23,6 +44,40 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+# Line plot of the fraction of inverted pairs over the course of a sort
+class SortednessPlot(QWidget):
+    # Once this many points are recorded, every other one is dropped
+    max_points = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(50)
+        self.points = []
+
+    def reset(self, inverted_fraction):
+        self.points = [inverted_fraction]
+        self.update()
+
+    def add_point(self, inverted_fraction):
+        self.points.append(inverted_fraction)
+        if len(self.points) > self.max_points:
+            self.points = self.points[::2]
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor('white'))
+        if len(self.points) > 1:
+            width = self.width() - 1
+            height = self.height() - 1
+            x_step = width / (len(self.points) - 1)
+            polygon = QPolygonF([
+                QPointF(i * x_step, height * (1 - fraction)) for i, fraction in enumerate(self.points)
+            ])
+            painter.setPen(QPen(QColor('blue')))
+            painter.drawPolyline(polygon)
+        painter.end()
+
 class SortingVisualizer(QWidget):
     def __init__(self, parent=None, array_size=50, algorithm_name="Bubble Sort"):
         super().__init__(parent)
@@ -53,20 +108,17 @@ class SortingVisualizer(QWidget):
 
         # Add dropdown to select sorting algorithm
         self.algorithm_dropdown = QComboBox()
-        self.algorithm_dropdown.addItems([
-            "Bubble Sort",
-            "Selection Sort",
-            "Insertion Sort",
-            "Merge Sort",
-            "Quick Sort",
-            "Heap Sort",
-            "Shell Sort",
-            "Cocktail Sort"
-        ])
+        self.algorithm_dropdown.addItems(ALGORITHM_NAMES + PARTIAL_ALGORITHM_NAMES)
         self.algorithm_dropdown.setCurrentText(algorithm_name)
         self.algorithm_dropdown.currentIndexChanged.connect(self.change_sorting_algorithm)
         layout.addWidget(self.algorithm_dropdown)
 
+        # Label explaining what Auto Sort dispatches to, only shown for Auto Sort
+        self.auto_choice_label = QLabel()
+        self.auto_choice_label.setWordWrap(True)
+        layout.addWidget(self.auto_choice_label)
+        self.update_auto_choice_label()
+
         # Labels to display stats
         self.comparisons_label = QLabel(f"Comparisons: {self.comparisons}")
         self.accesses_label = QLabel(f"Array Accesses: {self.accesses}")
@@ -77,6 +129,16 @@ class SortingVisualizer(QWidget):
         self.runtime_label = QLabel(f"Runtime: 0 ms")
         layout.addWidget(self.runtime_label)
 
+        # Sortedness meter and inversion plot. The inversion count is computed once when
+        # sorting starts and then updated from each swap or placement.
+        self.inversion_counter = None
+        self.sortedness_bar = QProgressBar()
+        self.sortedness_bar.setRange(0, 1000)
+        layout.addWidget(self.sortedness_bar)
+        self.sortedness_plot = SortednessPlot()
+        layout.addWidget(self.sortedness_plot)
+        self.reset_sortedness()
+
         # Add buttons and inputs arranged vertically
         self.buttons_layout = QVBoxLayout()
 
@@ -89,8 +151,18 @@ class SortingVisualizer(QWidget):
         layout.addLayout(self.buttons_layout)
         self.setLayout(layout)
         self.rectangles = []
-        # Delay create_bars() until the widget is fully loaded
-        QTimer.singleShot(0, self.create_bars) 
+
+        # Level-of-detail state. When the array has more elements than the view has
+        # pixel columns, each bar item draws one column bucket instead of one element.
+        self.lod_columns = None
+        self.range_items = []
+        self.bucket_bounds = []
+        self.bucket_of = []
+        self.bucket_min = []
+        self.bucket_max = []
+        self.bucket_last = []
+        self.bar_width = 0
+        self.scene_height = 0
 
         # Set up a QTimer for smooth animation
         self.timer = QTimer()
@@ -112,6 +184,10 @@ class SortingVisualizer(QWidget):
         # Track previously highlighted indices
         self.previous_highlighted_indices = []
 
+        # Bars are built when the view's viewport gets its first size. The viewport is
+        # resized after this widget, so its own resize events are the ones to follow.
+        self.view.viewport().installEventFilter(self)
+
     # Calculate steps_per_tick to ensure the green fill animation completes within the total_duration regardless of array size.
     def calculate_green_fill_parameters(self):
         num_bars = len(self.arr)
@@ -126,30 +202,99 @@ class SortingVisualizer(QWidget):
             self.green_fill_timer = None 
             self.reset_colors() 
 
-        scene_width = self.view.viewport().width()
-        scene_height = self.view.viewport().height()
-
-        bar_width = scene_width / len(self.arr)
         self.scene.clear()
         self.rectangles = []
-
-        for i, value in enumerate(self.arr):
-            bar_height = (value / self.max_value) * scene_height
-            rect_item = QGraphicsRectItem(QRectF(
-                i * bar_width,
-                scene_height - bar_height,
-                bar_width,
-                bar_height
-            ))
+        self.range_items = []
+
+        self.lod_columns = self.lod_column_count()
+        self.resize_bar_pool(self.lod_columns or len(self.arr))
+        self.layout_bars()
+
+    # Number of pixel columns to aggregate into, or None if every element fits in its own bar.
+    def lod_column_count(self):
+        columns = max(1, self.view.viewport().width())
+        return columns if len(self.arr) > columns else None
+
+    # Grow or shrink the pool of bar items to count, keeping the existing items.
+    def resize_bar_pool(self, count):
+        while len(self.rectangles) > count:
+            self.scene.removeItem(self.rectangles.pop())
+            if self.range_items:
+                self.scene.removeItem(self.range_items.pop())
+
+        while len(self.rectangles) < count:
+            if self.lod_columns is not None:
+                # Light band behind each column showing the min to max range of its bucket
+                range_item = QGraphicsRectItem()
+                range_item.setBrush(QColor('lightsteelblue'))
+                range_item.setPen(QPen(Qt.PenStyle.NoPen))
+                self.scene.addItem(range_item)
+                self.range_items.append(range_item)
+
+            rect_item = QGraphicsRectItem()
             rect_item.setBrush(QColor('blue'))
             rect_item.setPen(QPen(Qt.PenStyle.NoPen))
             self.scene.addItem(rect_item)
             self.rectangles.append(rect_item)
 
-    # Recreate bars when the window is resized
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        self.create_bars()  
+    # Position the existing bar items for the current view size. In level-of-detail mode a
+    # resize only remaps elements to columns; items are reused, not recreated.
+    def layout_bars(self):
+        columns = self.lod_column_count()
+        if not self.rectangles or (columns is None) != (self.lod_columns is None):
+            self.create_bars()
+            return
+
+        scene_width = self.view.viewport().width()
+        self.scene_height = self.view.viewport().height()
+        self.scene.setSceneRect(0, 0, scene_width, self.scene_height)
+
+        if columns is None:
+            self.bar_width = scene_width / len(self.arr)
+            for i, value in enumerate(self.arr):
+                self.update_bar(i, value)
+            return
+
+        if columns != self.lod_columns:
+            self.lod_columns = columns
+            self.resize_bar_pool(columns)
+
+        n = len(self.arr)
+        self.bar_width = scene_width / columns
+        self.bucket_bounds = [c * n // columns for c in range(columns + 1)]
+        self.bucket_of = [0] * n
+        self.bucket_min = [0] * columns
+        self.bucket_max = [0] * columns
+        self.bucket_last = [0] * columns
+        for c in range(columns):
+            start, end = self.bucket_bounds[c], self.bucket_bounds[c + 1]
+            self.bucket_of[start:end] = [c] * (end - start)
+            bucket = self.arr[start:end]
+            self.bucket_min[c] = min(bucket)
+            self.bucket_max[c] = max(bucket)
+            self.bucket_last[c] = bucket[-1]
+            self.draw_bucket(c)
+
+    # Redraw a level-of-detail column from its bucket state.
+    def draw_bucket(self, column):
+        x = column * self.bar_width
+        low = (self.bucket_min[column] / self.max_value) * self.scene_height
+        high = (self.bucket_max[column] / self.max_value) * self.scene_height
+        last = (self.bucket_last[column] / self.max_value) * self.scene_height
+        self.range_items[column].setRect(QRectF(x, self.scene_height - high, self.bar_width, high - low))
+        self.rectangles[column].setRect(QRectF(x, self.scene_height - last, self.bar_width, last))
+
+    # The bar item that draws the given array index.
+    def bar_item(self, index):
+        if self.lod_columns is None:
+            return self.rectangles[index]
+        return self.rectangles[self.bucket_of[index]]
+
+    # Reposition bars whenever the view's viewport is resized
+    def eventFilter(self, watched, event):
+        if watched is self.view.viewport() and event.type() == QEvent.Type.Resize:
+            self.layout_bars()
+        return super().eventFilter(watched, event)
 
     def visualize_step(self):
         try:
@@ -159,18 +304,33 @@ class SortingVisualizer(QWidget):
                 # Reset the previous bar colors
                 self.reset_colors()
 
+                # Network sorts compare a whole stage of pairs at once
+                if isinstance(i, list):
+                    indices = step_indices(i, j)
+                    for index in indices:
+                        self.bar_item(index).setBrush(QColor('red'))
+                        if swap:
+                            self.update_bar(index, self.arr[index])
+                            self.inversion_counter.update(index, self.arr[index])
+                    self.previous_highlighted_indices = indices
+                    self.accesses += accesses
+                    self.comparisons += len(i)
+                    continue
+
                 # Handle comparison or placement
                 if i != j:
-                    self.rectangles[i].setBrush(QColor('red'))
-                    self.rectangles[j].setBrush(QColor('red'))
+                    self.bar_item(i).setBrush(QColor('red'))
+                    self.bar_item(j).setBrush(QColor('red'))
                 else:
-                    self.rectangles[i].setBrush(QColor('blue'))
+                    self.bar_item(i).setBrush(QColor('blue'))
 
                 # Update the heights of the bars after placement
                 self.update_bar(i, self.arr[i])
 
                 if swap:
                     self.update_bar(j, self.arr[j])
+                    self.inversion_counter.update(i, self.arr[i])
+                    self.inversion_counter.update(j, self.arr[j])
 
                 # Update the list of highlighted indices
                 if i != j:
@@ -182,11 +342,13 @@ class SortingVisualizer(QWidget):
                 self.comparisons += 1
 
             self.update_labels()
+            self.update_sortedness()
 
         except StopIteration:
             # Once sorting is done, reset the colors and stop the timer
             self.reset_colors()
             self.timer.stop()
+            self.update_sortedness()
 
             # Calculate elapsed time including delays
             elapsed_time = (time.perf_counter() - self.start_time) * 1000 
@@ -225,39 +387,65 @@ class SortingVisualizer(QWidget):
             end_index = min(self.current_green_index + self.steps_per_tick, len(self.green_fill_indices))
             for idx in range(self.current_green_index, end_index):
                 index = self.green_fill_indices[idx]
-                self.rectangles[index].setBrush(QColor('green'))
+                self.bar_item(index).setBrush(QColor('green'))
             self.current_green_index = end_index
         else:
             self.green_fill_timer.stop()
             self.green_fill_timer = None
 
     def update_bar(self, index, value):
-        scene_height = self.view.viewport().height()
-
-        bar_height = (value / self.max_value) * scene_height
-        rect_item = self.rectangles[index]
-        rect_item.setRect(QRectF(
-            rect_item.rect().x(),
-            scene_height - bar_height,
-            rect_item.rect().width(),
+        if self.lod_columns is not None:
+            # Only the touched bucket is rescanned, which is a handful of elements per pixel
+            column = self.bucket_of[index]
+            bucket = self.arr[self.bucket_bounds[column]:self.bucket_bounds[column + 1]]
+            self.bucket_min[column] = min(bucket)
+            self.bucket_max[column] = max(bucket)
+            self.bucket_last[column] = value
+            self.draw_bucket(column)
+            return
+
+        bar_height = (value / self.max_value) * self.scene_height
+        self.rectangles[index].setRect(QRectF(
+            index * self.bar_width,
+            self.scene_height - bar_height,
+            self.bar_width,
             bar_height
         ))
 
     def reset_colors(self):
         for index in self.previous_highlighted_indices:
-            self.rectangles[index].setBrush(QColor('blue'))
+            self.bar_item(index).setBrush(QColor('blue'))
         self.previous_highlighted_indices = []
 
     def update_labels(self):
         self.comparisons_label.setText(f"Comparisons: {self.comparisons}")
         self.accesses_label.setText(f"Array Accesses: {self.accesses}")
 
+    def show_sortedness(self, inversions, max_inversions):
+        percent = 100.0 if max_inversions == 0 else 100.0 * (1 - inversions / max_inversions)
+        self.sortedness_bar.setValue(round(percent * 10))
+        self.sortedness_bar.setFormat(f"{percent:.1f}% sorted ({inversions} inversions)")
+        return 0.0 if max_inversions == 0 else inversions / max_inversions
+
+    # Show the sortedness of an array that is not being sorted, with a one point plot
+    def reset_sortedness(self):
+        self.inversion_counter = None
+        n = len(self.arr)
+        self.sortedness_plot.reset(self.show_sortedness(count_inversions(self.arr), n * (n - 1) // 2))
+
+    # Show the incrementally maintained count and add it to the plot
+    def update_sortedness(self):
+        counter = self.inversion_counter
+        self.sortedness_plot.add_point(self.show_sortedness(counter.inversions, counter.max_inversions))
+
     def set_array_size(self, size):
         self.array_size = size
         self.arr = random.sample(range(1, self.array_size + 1), self.array_size)
         self.max_value = max(self.arr)
         self.create_bars()
         self.calculate_green_fill_parameters()
+        self.update_auto_choice_label()
+        self.reset_sortedness()
 
     def set_timer_interval(self, interval):
         self.timer_interval = interval
@@ -285,6 +473,8 @@ class SortingVisualizer(QWidget):
 
         # Recalculate green fill parameters after shuffling
         self.calculate_green_fill_parameters()
+        self.update_auto_choice_label()
+        self.reset_sortedness()
 
     def start_sorting(self):
         self.timer.stop()
@@ -292,6 +482,10 @@ class SortingVisualizer(QWidget):
             self.green_fill_timer.stop()
             self.green_fill_timer = None
 
+        self.update_auto_choice_label()
+        self.inversion_counter = InversionCounter(self.arr)
+        counter = self.inversion_counter
+        self.sortedness_plot.reset(self.show_sortedness(counter.inversions, counter.max_inversions))
         self.sort_generator = self.sorting_algorithm(self.arr)
         # Reset counters
         self.comparisons = 0
@@ -309,6 +503,16 @@ class SortingVisualizer(QWidget):
     def change_sorting_algorithm(self):
         selected_algorithm = self.algorithm_dropdown.currentText()
         self.sorting_algorithm = get_algorithm_by_name(selected_algorithm)
+        self.update_auto_choice_label()
+
+    # Explain which algorithm Auto Sort would pick for the current array, and why
+    def update_auto_choice_label(self):
+        if self.algorithm_dropdown.currentText() != "Auto Sort":
+            self.auto_choice_label.hide()
+            return
+        name, reason = choose_algorithm(measure_presortedness(self.arr))
+        self.auto_choice_label.setText(f"Auto: {name}, {reason}")
+        self.auto_choice_label.show()
 
     def closeEvent(self, event):
         # Stop the main visualization timer
@@ -387,25 +591,18 @@ class MainWindow(QWidget):
         benchmark_group = QGroupBox("Benchmark Settings")
         benchmark_group_layout = QVBoxLayout()
 
-        # Algorithm Checkboxes
+        # Algorithm Checkboxes, wrapped into rows so the window stays narrow as
+        # algorithms are added
         self.algorithm_checkboxes = []
-        algorithms = [
-            "Bubble Sort",
-            "Selection Sort",
-            "Insertion Sort",
-            "Merge Sort",
-            "Quick Sort",
-            "Heap Sort",
-            "Shell Sort",
-            "Cocktail Sort"
-        ]
-        checkbox_layout = QHBoxLayout()
-        for algo in algorithms:
+        checkbox_layout = QGridLayout()
+        checkbox_columns = 7
+        for index, algo in enumerate(ALGORITHM_NAMES + PARTIAL_ALGORITHM_NAMES):
+            row, column = divmod(index, checkbox_columns)
             checkbox = QCheckBox(algo)
-            checkbox.setChecked(True)
+            checkbox.setChecked(algo not in PARTIAL_ALGORITHM_NAMES)
             checkbox.stateChanged.connect(self.update_benchmark_button_state)
             self.algorithm_checkboxes.append(checkbox)
-            checkbox_layout.addWidget(checkbox)
+            checkbox_layout.addWidget(checkbox, row, column)
         benchmark_group_layout.addLayout(checkbox_layout)
 
         # Max Size and Step Size inputs arranged horizontally
@@ -425,6 +622,21 @@ class MainWindow(QWidget):
         step_size_layout.addWidget(self.benchmark_step_size_input)
         benchmark_input_layout.addLayout(step_size_layout)
 
+        # Time budget input, leave empty to run every size
+        time_budget_layout = QVBoxLayout()
+        self.benchmark_time_budget_input = QLineEdit("500")
+        time_budget_layout.addWidget(QLabel("Time Budget (ms):"))
+        time_budget_layout.addWidget(self.benchmark_time_budget_input)
+        benchmark_input_layout.addLayout(time_budget_layout)
+
+        # k as a fraction of the array size for the partial operations, leave empty
+        # for their defaults
+        k_fraction_layout = QVBoxLayout()
+        self.benchmark_k_fraction_input = QLineEdit("0.1")
+        k_fraction_layout.addWidget(QLabel("K Fraction:"))
+        k_fraction_layout.addWidget(self.benchmark_k_fraction_input)
+        benchmark_input_layout.addLayout(k_fraction_layout)
+
         benchmark_group_layout.addLayout(benchmark_input_layout)
 
         # Benchmark Button
@@ -433,6 +645,36 @@ class MainWindow(QWidget):
         self.benchmark_button.setEnabled(True)
         benchmark_group_layout.addWidget(self.benchmark_button)
 
+        # Open Results Button, for datasets merged from sharded sweeps
+        self.open_results_button = QPushButton("Open Results...")
+        self.open_results_button.clicked.connect(self.open_benchmark_results)
+        benchmark_group_layout.addWidget(self.open_results_button)
+
+        # Submit the sweep to a running sortService.py instead of running it here
+        service_layout = QHBoxLayout()
+        service_layout.addWidget(QLabel("Service URL:"))
+        self.service_url_input = QLineEdit("http://127.0.0.1:8765")
+        service_layout.addWidget(self.service_url_input)
+        self.service_submit_button = QPushButton("Submit to Service")
+        self.service_submit_button.clicked.connect(self.submit_to_service)
+        service_layout.addWidget(self.service_submit_button)
+        self.service_cancel_button = QPushButton("Cancel Job")
+        self.service_cancel_button.clicked.connect(self.cancel_service_job)
+        self.service_cancel_button.setEnabled(False)
+        service_layout.addWidget(self.service_cancel_button)
+        benchmark_group_layout.addLayout(service_layout)
+        self.service_progress_bar = QProgressBar()
+        self.service_progress_bar.setFormat("No service job")
+        self.service_progress_bar.setValue(0)
+        benchmark_group_layout.addWidget(self.service_progress_bar)
+
+        # Polls the submitted job until it finishes
+        self.service_client = None
+        self.service_job_id = None
+        self.service_timer = QTimer()
+        self.service_timer.setInterval(500)
+        self.service_timer.timeout.connect(self.poll_service_job)
+
         benchmark_group.setLayout(benchmark_group_layout)
         benchmark_controls_layout.addWidget(benchmark_group)
         main_layout.addLayout(benchmark_controls_layout)
@@ -455,6 +697,24 @@ class MainWindow(QWidget):
 
         self.setLayout(main_layout)
 
+        # Benchmark results window, once a benchmark has been shown
+        self.chart_window = None
+
+        self.first_paint_seen = False
+
+    # Record the first frame for the startup report. The mark is taken after the
+    # event loop finishes this paint pass, so the child views are included.
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_seen:
+            self.first_paint_seen = True
+            QTimer.singleShot(0, self.finish_first_paint)
+
+    def finish_first_paint(self):
+        mark_startup("first paint")
+        if startup_report_requested():
+            print_startup_report()
+
     def adjust_array_size(self):
         self.visualizer1.timer.stop()
         self.visualizer2.timer.stop()
@@ -489,12 +749,9 @@ class MainWindow(QWidget):
         self.visualizer1.start_sorting()
         self.visualizer2.start_sorting()
 
-    def run_benchmark(self):
-        selected_algorithms = [cb.text() for cb in self.algorithm_checkboxes if cb.isChecked()]
-        if not selected_algorithms:
-            print("No algorithms selected for benchmarking.")
-            return
-
+    # Read the benchmark settings, correcting invalid inputs in place. Returns
+    # (sizes, time_budget_ms, k_fraction).
+    def benchmark_settings(self):
         # Get max size and step size from inputs
         try:
             max_size = int(self.benchmark_max_size_input.text())
@@ -512,139 +769,164 @@ class MainWindow(QWidget):
             step_size = 1
             self.benchmark_step_size_input.setText(str(step_size))
 
-        sizes = list(range(0, max_size + 1, step_size))
-        runtimes_dict = {algo: [] for algo in selected_algorithms}
+        # An empty or non-positive time budget disables the cutoff
+        try:
+            time_budget_ms = float(self.benchmark_time_budget_input.text())
+        except ValueError:
+            time_budget_ms = None
+            self.benchmark_time_budget_input.setText("")
+        if time_budget_ms is not None and time_budget_ms <= 0:
+            time_budget_ms = None
+            self.benchmark_time_budget_input.setText("")
+
+        # k/n for the partial operations, clamped to [0, 1]
+        try:
+            k_fraction = min(max(float(self.benchmark_k_fraction_input.text()), 0.0), 1.0)
+            self.benchmark_k_fraction_input.setText(f"{k_fraction:g}")
+        except ValueError:
+            k_fraction = None
+            self.benchmark_k_fraction_input.setText("")
 
-        for algo_name in selected_algorithms:
-            sorting_function = get_algorithm_by_name(algo_name, False)
-            for size in sizes:
-                arr = random.sample(range(size), size)
-                arr_copy = arr.copy()
+        return list(range(0, max_size + 1, step_size)), time_budget_ms, k_fraction
 
-                start_time = time.perf_counter()
+    def run_benchmark(self):
+        selected_algorithms = [cb.text() for cb in self.algorithm_checkboxes if cb.isChecked()]
+        if not selected_algorithms:
+            print("No algorithms selected for benchmarking.")
+            return
 
-                # Run the sorting algorithm without visualization
-                sort_generator = sorting_function(arr_copy)
-                for _ in sort_generator:
-                    pass  # We don't need to process the steps
+        from sortBenchmark import run_sweep
 
-                end_time = time.perf_counter()
-                elapsed_time = (end_time - start_time) * 1000
-                runtimes_dict[algo_name].append(elapsed_time)
+        sizes, time_budget_ms, k_fraction = self.benchmark_settings()
+        runtimes_dict, truncated_dict = run_sweep(selected_algorithms, sizes, time_budget_ms, k_fraction=k_fraction)
 
         # Display all benchmark results on a single chart
-        self.display_benchmark_results(sizes, runtimes_dict, selected_algorithms)
+        self.display_benchmark_results(sizes, runtimes_dict, selected_algorithms, truncated_dict, k_fraction)
+
+    def display_benchmark_results(self, sizes, runtimes_dict, algorithm_names, truncated_dict=None, k_fraction=None):
+        from benchmarkWindow import QChartWindow
 
-    def display_benchmark_results(self, sizes, runtimes_dict, algorithm_names):
         # Create a new window to display the chart
-        self.chart_window = QChartWindow(sizes, runtimes_dict, algorithm_names)
+        self.chart_window = QChartWindow(sizes, runtimes_dict, algorithm_names, truncated_dict, k_fraction)
         self.chart_window.show()
 
+    def submit_to_service(self):
+        selected_algorithms = [cb.text() for cb in self.algorithm_checkboxes if cb.isChecked()]
+        if not selected_algorithms:
+            print("No algorithms selected for benchmarking.")
+            return
+
+        from sortService import ServiceClient, ServiceError
+
+        sizes, time_budget_ms, k_fraction = self.benchmark_settings()
+        self.service_client = ServiceClient(self.service_url_input.text())
+        try:
+            job = self.service_client.submit(
+                selected_algorithms, sizes, time_budget_ms=time_budget_ms, k_fraction=k_fraction
+            )
+        except (OSError, ServiceError) as e:
+            print(f"Could not submit to {self.service_client.url}: {e}")
+            return
+
+        self.service_job_id = job["id"]
+        self.service_submit_button.setEnabled(False)
+        self.service_cancel_button.setEnabled(True)
+        self.show_service_job(job)
+        self.service_timer.start()
+
+    def cancel_service_job(self):
+        from sortService import ServiceError
+
+        try:
+            self.service_client.cancel(self.service_job_id)
+        except (OSError, ServiceError) as e:
+            print(f"Could not cancel job {self.service_job_id}: {e}")
+
+    def show_service_job(self, job):
+        self.service_progress_bar.setValue(round(100 * job["progress"]))
+        self.service_progress_bar.setFormat(f"Job {job['id']} {job['status']} %p%")
+
+    def poll_service_job(self):
+        from sortService import ServiceError
+
+        try:
+            job = self.service_client.job(self.service_job_id)
+            self.show_service_job(job)
+            if job["status"] not in ("done", "failed", "cancelled"):
+                return
+            self.service_timer.stop()
+            self.service_submit_button.setEnabled(True)
+            self.service_cancel_button.setEnabled(False)
+            if job["status"] == "failed":
+                print(f"Job {job['id']} failed: {job['error']}")
+            if job["status"] != "done":
+                return
+            dataset = self.service_client.results(job["id"])
+        except (OSError, ServiceError) as e:
+            self.service_timer.stop()
+            self.service_submit_button.setEnabled(True)
+            self.service_cancel_button.setEnabled(False)
+            print(f"Lost contact with {self.service_client.url}: {e}")
+            return
+
+        from sortBenchmark import dataset_series
+
+        sizes, runtimes_dict, series_names, truncated_dict = dataset_series(dataset)
+        self.display_benchmark_results(
+            sizes, runtimes_dict, series_names, truncated_dict, dataset["spec"].get("k_fraction")
+        )
+
+    # Open a merged sweep dataset (or a single shard result) written by sortBenchmark.py
+    def open_benchmark_results(self):
+        from PyQt6.QtWidgets import QFileDialog
+        from sortBenchmark import dataset_series, load_json, merge_shards
+
+        filename, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Benchmark Results",
+            "",
+            "JSON Files (*.json);;All Files (*)",
+        )
+        if not filename:
+            return
+
+        try:
+            dataset = load_json(filename)
+            if "shard" in dataset:
+                dataset = merge_shards([dataset])
+            sizes, runtimes_dict, series_names, truncated_dict = dataset_series(dataset)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not open benchmark results {filename}: {e}")
+            return
+
+        self.display_benchmark_results(
+            sizes, runtimes_dict, series_names, truncated_dict, dataset["spec"].get("k_fraction")
+        )
+
     def update_benchmark_button_state(self):
         # Enable the benchmark button if at least one checkbox is checked
         any_checked = any(cb.isChecked() for cb in self.algorithm_checkboxes)
         self.benchmark_button.setEnabled(any_checked)
 
     def closeEvent(self, event):
-        # Close child SortingVisualizer instances
+        # Close child SortingVisualizer instances, and the chart window so a profile it
+        # is running does not keep the application alive
         self.visualizer1.close()
         self.visualizer2.close()
+        if self.chart_window is not None:
+            self.chart_window.close()
         # Ensure the application quits completely
         QApplication.quit()
         event.accept()
 
-class QChartWindow(QWidget):
-    def __init__(self, sizes, runtimes_dict, algorithm_names):
-        super().__init__()
-        self.setWindowTitle("Benchmark Results")
-        self.setMinimumSize(1000, 800)
-
-        # Create the chart
-        self.chart = QChart()
-        self.chart.setTitle("Benchmark Results")
-
-        # Define a list of colors for different algorithms
-        colors = [
-            QColor('red'), QColor('green'), QColor('blue'),
-            QColor('magenta'), QColor('cyan'), QColor('orange'),
-            QColor('purple'), QColor('brown'), QColor('pink'),
-            QColor('gray')
-        ]
-
-        # Add a QLineSeries for each algorithm
-        for idx, algo_name in enumerate(algorithm_names):
-            series = QLineSeries()
-            for size, runtime in zip(sizes, runtimes_dict[algo_name]):
-                series.append(size, runtime)
-            series.setName(algo_name)
-            series.setColor(colors[idx % len(colors)])
-            self.chart.addSeries(series)
-
-        self.chart.legend().setVisible(True)
-        self.chart.legend().setAlignment(Qt.AlignmentFlag.AlignBottom)
-
-        # Customize axes
-        axis_x = QValueAxis()
-        axis_x.setTitleText("Array Size (n)")
-        axis_x.setLabelFormat("%d")
-        max_labels = 10  # Maximum number of labels to display
-        tick_interval = max(1, len(sizes) // max_labels)
-        axis_x.setTickCount(min(len(sizes), max_labels + 1))
-        axis_x.setRange(min(sizes), max(sizes))
-
-        # Determine the maximum runtime across all algorithms for Y-axis range
-        max_runtime = max([max(runtimes) for runtimes in runtimes_dict.values()]) if algorithm_names else 100
-        axis_y = QValueAxis()
-        axis_y.setTitleText("Runtime (ms)")
-        axis_y.setLabelFormat("%.3f")
-        axis_y.setRange(0, max_runtime * 1.1)
-
-        # Set font sizes
-        font = QFont()
-        font.setPointSize(12)
-        axis_x.setLabelsFont(font)
-        axis_y.setLabelsFont(font)
-        axis_x.setTitleFont(font)
-        axis_y.setTitleFont(font)
-        self.chart.setTitleFont(font)
-
-        # Add axes to the chart
-        self.chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
-        self.chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
-
-        # Attach axes to the series
-        for series in self.chart.series():
-            series.attachAxis(axis_x)
-            series.attachAxis(axis_y)
-
-        # Create the chart view and set it as the central widget
-        self.chart_view = QChartView(self.chart)
-        self.chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        layout = QVBoxLayout()
-        layout.addWidget(self.chart_view)
-
-        # Add Save Graph button
-        self.save_button = QPushButton("Save Graph")
-        self.save_button.clicked.connect(self.save_graph)
-        layout.addWidget(self.save_button)
-
-        self.setLayout(layout)
-
-    def save_graph(self):
-        # Open a file dialog to save the image
-        filename, _ = QFileDialog.getSaveFileName(
-            self,
-            "Save Graph As",
-            "",
-            "PNG Files (*.png);;JPEG Files (*.jpg);;All Files (*)",
-        )
-        if filename:
-            pixmap = self.chart_view.grab()
-            pixmap.save(filename)
-
 if __name__ == '__main__':
+    # The chart window profiles in a spawned process, which a PyInstaller bundle
+    # must be able to start from this entry point
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
+    mark_startup("application")
 
     # Set the taskbar and window icon
     icon_path = resource_path("resources/sorticon.ico")
@@ -655,5 +937,7 @@ if __name__ == '__main__':
 
     # Instantiate the main window with two sorting visualizers
     main_window = MainWindow()
+    mark_startup("main window")
     main_window.show()
+    mark_startup("shown")
     sys.exit(app.exec())
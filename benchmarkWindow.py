@@ -0,0 +1,208 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QComboBox, QLabel, QPlainTextEdit
+)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QPainter, QColor, QFont, QFontDatabase
+from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QScatterSeries, QValueAxis
+
+# Benchmark results window. Kept out of SortingApp so QtCharts is only loaded
+# when the first benchmark is displayed.
+class QChartWindow(QWidget):
+    def __init__(self, sizes, runtimes_dict, algorithm_names, truncated_dict=None, k_fraction=None):
+        super().__init__()
+        self.k_fraction = k_fraction
+        self.profile_window = None
+
+        # Profiles run in a worker process, so the traced run (many times slower than
+        # the benchmark for the quadratic sorts) neither freezes the window nor shares
+        # the GIL and sys.monitoring with it. A timer polls for the result, and closing
+        # the window terminates the process.
+        self.profile_pool = None
+        self.profile_result = None
+        self.profile_title = ""
+        self.profile_timer = QTimer()
+        self.profile_timer.setInterval(100)
+        self.profile_timer.timeout.connect(self.poll_profile)
+
+        self.setWindowTitle("Benchmark Results")
+        self.setMinimumSize(1000, 800)
+
+        # Create the chart
+        self.chart = QChart()
+        self.chart.setTitle("Benchmark Results")
+
+        # Define a list of colors for different algorithms
+        colors = [
+            QColor('red'), QColor('green'), QColor('blue'),
+            QColor('magenta'), QColor('cyan'), QColor('orange'),
+            QColor('purple'), QColor('brown'), QColor('pink'),
+            QColor('gray')
+        ]
+
+        truncated_dict = truncated_dict or {}
+
+        # Add a QLineSeries for each algorithm
+        for idx, algo_name in enumerate(algorithm_names):
+            color = colors[idx % len(colors)]
+            series = QLineSeries()
+            for size, runtime in zip(sizes, runtimes_dict[algo_name]):
+                series.append(size, runtime)
+            series.setColor(color)
+            self.chart.addSeries(series)
+
+            # Mark where an algorithm was cut off by the time budget
+            truncated_at = truncated_dict.get(algo_name)
+            if truncated_at is None:
+                series.setName(algo_name)
+            else:
+                series.setName(f"{algo_name} (truncated at n={truncated_at})")
+                marker = QScatterSeries()
+                marker.setMarkerShape(QScatterSeries.MarkerShape.MarkerShapeRectangle)
+                marker.setMarkerSize(10)
+                marker.setColor(color)
+                marker.append(truncated_at, runtimes_dict[algo_name][-1])
+                self.chart.addSeries(marker)
+                self.chart.legend().markers(marker)[0].setVisible(False)
+
+        self.chart.legend().setVisible(True)
+        self.chart.legend().setAlignment(Qt.AlignmentFlag.AlignBottom)
+
+        # Customize axes
+        axis_x = QValueAxis()
+        axis_x.setTitleText("Array Size (n)")
+        axis_x.setLabelFormat("%d")
+        max_labels = 10  # Maximum number of labels to display
+        tick_interval = max(1, len(sizes) // max_labels)
+        axis_x.setTickCount(min(len(sizes), max_labels + 1))
+        axis_x.setRange(min(sizes), max(sizes))
+
+        # Determine the maximum runtime across all algorithms for Y-axis range
+        max_runtime = max([max(runtimes, default=0) for runtimes in runtimes_dict.values()]) if algorithm_names else 100
+        axis_y = QValueAxis()
+        axis_y.setTitleText("Runtime (ms)")
+        axis_y.setLabelFormat("%.3f")
+        axis_y.setRange(0, max_runtime * 1.1)
+
+        # Set font sizes
+        font = QFont()
+        font.setPointSize(12)
+        axis_x.setLabelsFont(font)
+        axis_y.setLabelsFont(font)
+        axis_x.setTitleFont(font)
+        axis_y.setTitleFont(font)
+        self.chart.setTitleFont(font)
+
+        # Add axes to the chart
+        self.chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
+        self.chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
+
+        # Attach axes to the series
+        for series in self.chart.series():
+            series.attachAxis(axis_x)
+            series.attachAxis(axis_y)
+
+        # Create the chart view and set it as the central widget
+        self.chart_view = QChartView(self.chart)
+        self.chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.chart_view)
+
+        # Re-run one algorithm at one size under the line profiler
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(QLabel("Profile:"))
+        self.profile_algorithm_dropdown = QComboBox()
+        self.profile_algorithm_dropdown.addItems(algorithm_names)
+        profile_layout.addWidget(self.profile_algorithm_dropdown)
+        self.profile_size_dropdown = QComboBox()
+        profile_layout.addWidget(self.profile_size_dropdown)
+        self.profile_button = QPushButton("Profile")
+        self.profile_button.clicked.connect(self.profile_selected)
+        profile_layout.addWidget(self.profile_button)
+        layout.addLayout(profile_layout)
+        self.sizes = sizes
+        self.runtimes_dict = runtimes_dict
+        self.profile_algorithm_dropdown.currentIndexChanged.connect(self.update_profile_sizes)
+        self.update_profile_sizes()
+
+        # Add Save Graph button
+        self.save_button = QPushButton("Save Graph")
+        self.save_button.clicked.connect(self.save_graph)
+        layout.addWidget(self.save_button)
+
+        self.setLayout(layout)
+
+    # Offer only the sizes the selected algorithm ran, not those past its time budget
+    # cutoff, which would be the slowest to profile
+    def update_profile_sizes(self):
+        runtimes = self.runtimes_dict.get(self.profile_algorithm_dropdown.currentText(), [])
+        self.profile_size_dropdown.clear()
+        self.profile_size_dropdown.addItems([str(size) for size in self.sizes[:len(runtimes)] if size > 0])
+        running = self.profile_result is not None
+        self.profile_button.setEnabled(self.profile_size_dropdown.count() > 0 and not running)
+
+    # Profile the selected algorithm in the worker process; poll_profile shows the result
+    def profile_selected(self):
+        from sortBenchmark import series_target
+        from sortProfiler import profile_algorithm
+
+        if self.profile_pool is None:
+            import multiprocessing
+
+            self.profile_pool = multiprocessing.get_context("spawn").Pool(1)
+
+        algo_name, distribution = series_target(self.profile_algorithm_dropdown.currentText())
+        size = int(self.profile_size_dropdown.currentText())
+        self.profile_title = f"Profile: {algo_name}, n={size}"
+        self.profile_result = self.profile_pool.apply_async(
+            profile_algorithm, (algo_name, size, distribution), {"k_fraction": self.k_fraction}
+        )
+        self.profile_button.setEnabled(False)
+        self.profile_button.setText("Profiling...")
+        self.profile_timer.start()
+
+    # Show the hottest lines of the profiled algorithm, with the profiler's overhead
+    def poll_profile(self):
+        if not self.profile_result.ready():
+            return
+        self.profile_timer.stop()
+        result, self.profile_result = self.profile_result, None
+        self.profile_button.setEnabled(True)
+        self.profile_button.setText("Profile")
+
+        from sortProfiler import format_profile
+
+        try:
+            text = format_profile(result.get())
+        except Exception as e:
+            text = f"Profiling failed: {type(e).__name__}: {e}"
+
+        self.profile_window = QPlainTextEdit(text)
+        self.profile_window.setWindowTitle(self.profile_title)
+        self.profile_window.setReadOnly(True)
+        self.profile_window.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.profile_window.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.profile_window.resize(1000, 500)
+        self.profile_window.show()
+
+    # A profile still running is stopped with the window
+    def closeEvent(self, event):
+        self.profile_timer.stop()
+        self.profile_result = None
+        if self.profile_pool is not None:
+            self.profile_pool.terminate()
+            self.profile_pool.join()
+            self.profile_pool = None
+        super().closeEvent(event)
+
+    def save_graph(self):
+        # Open a file dialog to save the image
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Graph As",
+            "",
+            "PNG Files (*.png);;JPEG Files (*.jpg);;All Files (*)",
+        )
+        if filename:
+            pixmap = self.chart_view.grab()
+            pixmap.save(filename)
@@ -1,4 +1,33 @@
+import functools
+import itertools
+import operator
+import random
+
 # Sorting algorithm retrieval
+
+# Names of the available algorithms, in the order they are shown in the UI
+ALGORITHM_NAMES = [
+    "Bubble Sort",
+    "Selection Sort",
+    "Insertion Sort",
+    "Merge Sort",
+    "Quick Sort",
+    "Heap Sort",
+    "Shell Sort",
+    "Cocktail Sort",
+    "Bitonic Sort",
+    "Odd-Even Merge Sort",
+    "Auto Sort"
+]
+
+# Operations that only order part of the array, shown after the full sorts. They take
+# an optional k; see "Partial sorting and selection" below.
+PARTIAL_ALGORITHM_NAMES = [
+    "Partial Sort",
+    "Top-K",
+    "Nth Element"
+]
+
 def get_algorithm_by_name(name, use_yield=True):
     if use_yield:
         if name == "Bubble Sort":
@@ -17,6 +46,18 @@ def get_algorithm_by_name(name, use_yield=True):
             return shell_sort
         elif name == "Cocktail Sort":
             return cocktail_sort
+        elif name == "Bitonic Sort":
+            return bitonic_sort
+        elif name == "Odd-Even Merge Sort":
+            return odd_even_merge_sort
+        elif name == "Auto Sort":
+            return auto_sort
+        elif name == "Partial Sort":
+            return partial_sort
+        elif name == "Top-K":
+            return top_k
+        elif name == "Nth Element":
+            return nth_element
     else:
         if name == "Bubble Sort":
             return bubble_sort_no_yield
@@ -34,10 +75,132 @@ def get_algorithm_by_name(name, use_yield=True):
             return shell_sort_no_yield
         elif name == "Cocktail Sort":
             return cocktail_sort_no_yield
+        elif name == "Bitonic Sort":
+            return bitonic_sort_no_yield
+        elif name == "Odd-Even Merge Sort":
+            return odd_even_merge_sort_no_yield
+        elif name == "Auto Sort":
+            return auto_sort_no_yield
+        elif name == "Partial Sort":
+            return partial_sort_no_yield
+        elif name == "Top-K":
+            return top_k_no_yield
+        elif name == "Nth Element":
+            return nth_element_no_yield
     return bubble_sort_no_yield  # Default
 
+# Key function support
+
+# Wraps a key so that it orders in reverse. Equal keys still compare equal, so the
+# index in a decorated entry keeps reverse sorts stable.
+class _ReverseKey:
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __le__(self, other):
+        return other.key <= self.key
+
+    def __gt__(self, other):
+        return other.key > self.key
+
+    def __ge__(self, other):
+        return other.key >= self.key
+
+# Decorate arr into (key, index, value) entries. Each key is computed once, and the
+# unique index means values are never compared and equal keys keep their order.
+def _decorate(arr, key, reverse):
+    keys = list(arr) if key is None else [key(value) for value in arr]
+    if reverse:
+        # Plain numbers can be negated, which keeps comparisons in C
+        if all(type(k) is int or type(k) is float for k in keys):
+            keys = [-k for k in keys]
+        else:
+            keys = [_ReverseKey(k) for k in keys]
+    return [(k, i, value) for i, (k, value) in enumerate(zip(keys, arr))]
+
+# Add key= and reverse= to a fast sorting function. The undecorated values are
+# written back into arr, or returned as a new list if the function returns one.
+def keyed_sort(sorting_function):
+    @functools.wraps(sorting_function)
+    def wrapper(arr, *args, key=None, reverse=False, **kwargs):
+        if key is None and not reverse:
+            return sorting_function(arr, *args, **kwargs)
+
+        decorated = _decorate(arr, key, reverse)
+        result = sorting_function(decorated, *args, **kwargs)
+        if result is None or result is decorated:
+            if isinstance(arr, list):
+                arr[:] = [entry[2] for entry in decorated]
+            else:
+                for i, entry in enumerate(decorated):
+                    arr[i] = entry[2]
+            return arr
+        return [entry[2] for entry in result]
+    return wrapper
+
+# Add key= and reverse= to a visual sorting generator. The generator sorts the
+# decorated entries and every written index is mirrored back into arr before the
+# step is yielded, so the visualizer sees arr change exactly as it would unkeyed.
+def keyed_generator(sorting_generator):
+    @functools.wraps(sorting_generator)
+    def wrapper(arr, *args, key=None, reverse=False, **kwargs):
+        if key is None and not reverse:
+            return sorting_generator(arr, *args, **kwargs)
+        return _keyed_steps(sorting_generator, arr, key, reverse, args, kwargs)
+    return wrapper
+
+# Indices written by a step, for callers that mirror or redraw changed positions.
+# Stage steps from the network sorts carry lists of indices instead of a pair.
+def step_indices(i, j):
+    if isinstance(i, list):
+        return i + j
+    return (i, j)
+
+def _keyed_steps(sorting_generator, arr, key, reverse, args, kwargs):
+    decorated = _decorate(arr, key, reverse)
+    for step in sorting_generator(decorated, *args, **kwargs):
+        i, j, swap, _ = step
+        if swap:
+            for index in step_indices(i, j):
+                arr[index] = decorated[index][2]
+        yield step
+
+# Typed buffer support
+#
+# The fast algorithms sort lists and also writable buffers such as array('i'/'q'/'d'),
+# bytearray and memoryview in place, without converting them to lists.
+
+# Buffers are handled through a memoryview so slices are views rather than copies.
+def _as_view(arr):
+    if isinstance(arr, (list, memoryview)):
+        return arr
+    return memoryview(arr)
+
+# Copy a memoryview into a new buffer of the same format, for scratch space.
+def _copy_view(view):
+    return memoryview(bytearray(view)).cast(view.format)
+
+# Sort arr[start:end] in place with a fast sorting function. Buffers are sorted
+# through a memoryview slice so nothing is copied; lists sort a copy of the range
+# and assign it back.
+def sort_range(sorting_function, arr, start, end, **kwargs):
+    if isinstance(arr, list):
+        arr[start:end] = sorting_function(arr[start:end], **kwargs)
+    else:
+        sorting_function(memoryview(arr)[start:end], **kwargs)
+    return arr
+
 # Sorting algorithm implementations
 
+@keyed_generator
 def bubble_sort(arr):
     n = len(arr)
     for i in range(n):
@@ -51,6 +214,7 @@ def bubble_sort(arr):
         if not swapped:
             break
 
+@keyed_generator
 def selection_sort(arr):
     n = len(arr)
     for i in range(n):
@@ -65,6 +229,7 @@ def selection_sort(arr):
         else:
             yield i, min_idx, False, 2  # No swap
 
+@keyed_generator
 def insertion_sort(arr):
     n = len(arr)
     for i in range(1, n):
@@ -81,7 +246,11 @@ def insertion_sort(arr):
         arr[j + 1] = key
         yield j + 1, j + 1, True, 1  # Insertion
 
-def merge_sort(arr):
+# Recursive reference versions of merge, quick and heap sort. The registered
+# versions below produce the same steps from one flat generator frame; these are
+# kept to benchmark against ('sortBenchmark.py events').
+
+def merge_sort_recursive(arr):
     def merge_sort_rec(arr, start, end):
         if end - start > 1:
             mid = (start + end) // 2
@@ -123,7 +292,7 @@ def merge_sort(arr):
 
     yield from merge_sort_rec(arr, 0, len(arr))
 
-def quick_sort(arr):
+def quick_sort_recursive(arr):
     def quick_sort_rec(arr, low, high):
         if low < high:
             pi = yield from partition(arr, low, high)
@@ -145,7 +314,7 @@ def quick_sort(arr):
 
     yield from quick_sort_rec(arr, 0, len(arr) - 1)
 
-def heap_sort(arr):
+def heap_sort_recursive(arr):
     n = len(arr)
 
     def heapify(arr, n, i):
@@ -178,6 +347,126 @@ def heap_sort(arr):
         yield i, 0, True, 4  # Swap
         yield from heapify(arr, i, 0)
 
+# Iterative versions. Each keeps its pending work on an explicit stack, so every
+# step is yielded straight from this frame instead of travelling up a chain of
+# 'yield from' calls, and sorted or reversed input cannot hit the recursion limit.
+
+@keyed_generator
+def merge_sort(arr):
+    # Each entry is (start, end, halves_sorted); a range is pushed again to be
+    # merged once both halves, pushed above it, have been sorted
+    stack = [(0, len(arr), False)] if len(arr) > 1 else []
+    while stack:
+        start, end, halves_sorted = stack.pop()
+        mid = (start + end) // 2
+        if not halves_sorted:
+            stack.append((start, end, True))
+            if end - mid > 1:
+                stack.append((mid, end, False))
+            if mid - start > 1:
+                stack.append((start, mid, False))
+            continue
+
+        left_subarray = arr[start:mid]
+        right_subarray = arr[mid:end]
+
+        left_idx, right_idx = 0, 0
+        current_idx = start
+
+        while left_idx < len(left_subarray) and right_idx < len(right_subarray):
+            yield start + left_idx, mid + right_idx, False, 2  # Comparison
+
+            if left_subarray[left_idx] <= right_subarray[right_idx]:
+                arr[current_idx] = left_subarray[left_idx]
+                left_idx += 1
+            else:
+                arr[current_idx] = right_subarray[right_idx]
+                right_idx += 1
+
+            yield current_idx, current_idx, True, 1  # Placement
+            current_idx += 1
+
+        while left_idx < len(left_subarray):
+            arr[current_idx] = left_subarray[left_idx]
+            left_idx += 1
+            yield current_idx, current_idx, True, 1  # Placement
+            current_idx += 1
+
+        while right_idx < len(right_subarray):
+            arr[current_idx] = right_subarray[right_idx]
+            right_idx += 1
+            yield current_idx, current_idx, True, 1  # Placement
+            current_idx += 1
+
+@keyed_generator
+def quick_sort(arr):
+    return _quick_sort_steps(arr, 0, len(arr) - 1)
+
+def _quick_sort_steps(arr, low, high):
+    # Ranges still to partition; the left one is pushed last so it is done first
+    stack = [(low, high)]
+    while stack:
+        low, high = stack.pop()
+        if low >= high:
+            continue
+
+        pivot = arr[high]
+        i = low - 1
+        for j in range(low, high):
+            yield j, high, False, 2  # Comparison
+            if arr[j] < pivot:
+                i += 1
+                arr[i], arr[j] = arr[j], arr[i]
+                yield i, j, True, 4  # Swap
+        arr[i + 1], arr[high] = arr[high], arr[i + 1]
+        yield i + 1, high, True, 4  # Swap pivot
+
+        stack.append((i + 2, high))
+        stack.append((low, i))
+
+@keyed_generator
+def heap_sort(arr):
+    n = len(arr)
+    next_root = n // 2 - 1  # Next subtree to heapify while building the max heap
+    end = n - 1             # Next position to extract the maximum into
+    heap_size = n
+
+    while True:
+        if next_root >= 0:
+            i = next_root
+            next_root -= 1
+        elif end > 0:
+            arr[end], arr[0] = arr[0], arr[end]
+            yield end, 0, True, 4  # Swap
+            heap_size = end
+            end -= 1
+            i = 0
+        else:
+            break
+
+        # Sift arr[i] down until it is larger than both children
+        while True:
+            largest = i
+            l = 2 * i + 1     # Left child
+            r = 2 * i + 2     # Right child
+
+            if l < heap_size:
+                yield i, l, False, 2  # Comparison
+                if arr[l] > arr[largest]:
+                    largest = l
+
+            if r < heap_size:
+                yield largest, r, False, 2  # Comparison
+                if arr[r] > arr[largest]:
+                    largest = r
+
+            if largest == i:
+                break
+            arr[i], arr[largest] = arr[largest], arr[i]
+            yield i, largest, True, 4  # Swap
+            i = largest
+
+@keyed_generator
 def shell_sort(arr):
     n = len(arr)
     gap = n // 2
@@ -199,6 +488,7 @@ def shell_sort(arr):
             yield j, j, True, 1  # Insertion
         gap //= 2
 
+@keyed_generator
 def cocktail_sort(arr):
     n = len(arr)
     swapped = True
@@ -228,6 +518,7 @@ def cocktail_sort(arr):
 
 
 
+@keyed_sort
 def bubble_sort_no_yield(arr):
     n = len(arr)
     for i in range(n):
@@ -240,6 +531,7 @@ def bubble_sort_no_yield(arr):
             break
     return arr
 
+@keyed_sort
 def selection_sort_no_yield(arr):
     n = len(arr)
     for i in range(n):
@@ -251,6 +543,7 @@ def selection_sort_no_yield(arr):
             arr[i], arr[min_idx] = arr[min_idx], arr[i]
     return arr
 
+@keyed_sort
 def insertion_sort_no_yield(arr):
     for i in range(1, len(arr)):
         key = arr[i]
@@ -261,42 +554,72 @@ def insertion_sort_no_yield(arr):
         arr[j + 1] = key
     return arr
 
+@keyed_sort
 def merge_sort_no_yield(arr):
-    if len(arr) > 1:
-        mid = len(arr) // 2
-        L = arr[:mid]
-        R = arr[mid:]
-        merge_sort_no_yield(L)
-        merge_sort_no_yield(R)
-        i = j = k = 0
-        while i < len(L) and j < len(R):
-            if L[i] < R[j]:
+    def merge_sort_rec(arr):
+        if len(arr) > 1:
+            mid = len(arr) // 2
+            L = arr[:mid]
+            R = arr[mid:]
+            merge_sort_rec(L)
+            merge_sort_rec(R)
+            if isinstance(L, memoryview):
+                # Buffer halves are views sorted in place. Only the left one needs a
+                # copy, since the merge never writes past the unread part of the right.
+                L = _copy_view(L)
+            i = j = k = 0
+            while i < len(L) and j < len(R):
+                if L[i] <= R[j]:
+                    arr[k] = L[i]
+                    i += 1
+                else:
+                    arr[k] = R[j]
+                    j += 1
+                k += 1
+            while i < len(L):
                 arr[k] = L[i]
                 i += 1
-            else:
+                k += 1
+            while j < len(R):
                 arr[k] = R[j]
                 j += 1
-            k += 1
-        while i < len(L):
-            arr[k] = L[i]
-            i += 1
-            k += 1
-        while j < len(R):
-            arr[k] = R[j]
-            j += 1
-            k += 1
+                k += 1
+
+    merge_sort_rec(_as_view(arr))
     return arr
 
+@keyed_sort
 def quick_sort_no_yield(arr):
-    if len(arr) <= 1:
-        return arr
-    else:
-        pivot = arr[len(arr) // 2]
-        left = [x for x in arr if x < pivot]
-        middle = [x for x in arr if x == pivot]
-        right = [x for x in arr if x > pivot]
-        return quick_sort_no_yield(left) + middle + quick_sort_no_yield(right)
+    def quick_sort_rec(arr, low, high):
+        while low < high:
+            # Three-way partition around the middle element, so runs of equal values
+            # (common in bytearrays) are finished in one pass
+            pivot = arr[(low + high) // 2]
+            lt, i, gt = low, low, high
+            while i <= gt:
+                value = arr[i]
+                if value < pivot:
+                    arr[lt], arr[i] = value, arr[lt]
+                    lt += 1
+                    i += 1
+                elif value > pivot:
+                    arr[gt], arr[i] = value, arr[gt]
+                    gt -= 1
+                else:
+                    i += 1
+
+            # Recurse into the smaller side and loop on the larger to bound the depth
+            if lt - low < high - gt:
+                quick_sort_rec(arr, low, lt - 1)
+                low = gt + 1
+            else:
+                quick_sort_rec(arr, gt + 1, high)
+                high = lt - 1
 
+    quick_sort_rec(arr, 0, len(arr) - 1)
+    return arr
+
+@keyed_sort
 def heap_sort_no_yield(arr):
     def heapify(arr, n, i):
         largest = i
@@ -317,6 +640,7 @@ def heap_sort_no_yield(arr):
         heapify(arr, i, 0)
     return arr
 
+@keyed_sort
 def shell_sort_no_yield(arr):
     n = len(arr)
     gap = n // 2
@@ -331,6 +655,7 @@ def shell_sort_no_yield(arr):
         gap //= 2
     return arr
 
+@keyed_sort
 def cocktail_sort_no_yield(arr):
     n = len(arr)
     swapped = True
@@ -351,4 +676,738 @@ def cocktail_sort_no_yield(arr):
                 arr[i], arr[i + 1] = arr[i + 1], arr[i]
                 swapped = True
         start += 1
-    return arr
\ No newline at end of file
+    return arr
+
+# Sorting networks
+#
+# Bitonic and odd-even merge sort compare fixed index pairs that do not depend on the
+# data. The pairs are grouped into stages whose comparators touch disjoint indices, so
+# a whole stage can run at once: the fast versions apply each stage as one vectorized
+# NumPy compare-exchange, and the visual versions yield one step per stage with lists
+# of indices, (lows, highs, swapped_any, accesses).
+
+# Stage arrays are only worth building for NumPy above this size
+NUMPY_MIN_SIZE = 256
+
+# NumPy is optional and only imported the first time a network sort needs it, so it
+# never slows down startup
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+# Networks are built for the next power of two; comparators that reach past n are
+# dropped, which is the same as padding the input with +infinity.
+def _padded_size(n):
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+def _stage_tuples(stages, n):
+    result = []
+    for pairs in stages:
+        pairs = [(lo, hi) for lo, hi in pairs if hi < n]
+        if pairs:
+            result.append((tuple(lo for lo, _ in pairs), tuple(hi for _, hi in pairs)))
+    return tuple(result)
+
+# Bitonic sort with every comparator ascending: each merge starts by comparing the
+# lower half of a block with the mirrored upper half, then halves the distance.
+@functools.lru_cache(maxsize=64)
+def bitonic_stages(n):
+    size = _padded_size(n)
+    stages = []
+    k = 2
+    while k <= size:
+        stages.append([(i, i ^ (k - 1)) for i in range(size) if i & (k // 2) == 0])
+        j = k // 4
+        while j > 0:
+            stages.append([(i, i ^ j) for i in range(size) if i & j == 0])
+            j //= 2
+        k *= 2
+    return _stage_tuples(stages, n)
+
+# Batcher's odd-even merge sort, which needs fewer comparators than bitonic sort for
+# the same number of stages
+@functools.lru_cache(maxsize=64)
+def odd_even_merge_stages(n):
+    size = _padded_size(n)
+    stages = []
+    p = 1
+    while p < size:
+        k = p
+        while k >= 1:
+            pairs = []
+            for j in range(k % p, size - k, 2 * k):
+                for i in range(min(k, size - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        pairs.append((i + j, i + j + k))
+            stages.append(pairs)
+            k //= 2
+        p *= 2
+    return _stage_tuples(stages, n)
+
+# The same stages built directly as NumPy index arrays, since building the tuples
+# first would cost more than the sort itself at large n
+def _bitonic_numpy_stages(np, n):
+    size = _padded_size(n)
+    indices = np.arange(size)
+    stages = []
+    k = 2
+    while k <= size:
+        lows = indices[indices & (k // 2) == 0]
+        stages.append((lows, lows ^ (k - 1)))
+        j = k // 4
+        while j > 0:
+            lows = indices[indices & j == 0]
+            stages.append((lows, lows ^ j))
+            j //= 2
+        k *= 2
+    return stages
+
+def _odd_even_merge_numpy_stages(np, n):
+    size = _padded_size(n)
+    stages = []
+    p = 1
+    while p < size:
+        k = p
+        while k >= 1:
+            starts = np.arange(k % p, size - k, 2 * k)
+            lows = (starts[:, None] + np.arange(k)[None, :]).ravel()
+            lows = lows[(lows < size - k) & (lows // (2 * p) == (lows + k) // (2 * p))]
+            stages.append((lows, lows + k))
+            k //= 2
+        p *= 2
+    return stages
+
+_NUMPY_STAGE_BUILDERS = {
+    bitonic_stages: _bitonic_numpy_stages,
+    odd_even_merge_stages: _odd_even_merge_numpy_stages,
+}
+
+@functools.lru_cache(maxsize=16)
+def _numpy_stages(stage_function, n):
+    np = _numpy()
+    stages = []
+    for lows, highs in _NUMPY_STAGE_BUILDERS[stage_function](np, n):
+        keep = highs < n
+        if keep.any():
+            stages.append((lows[keep], highs[keep]))
+    return stages
+
+# A NumPy array holding arr's values, or None if arr is not plain numbers. Buffers are
+# wrapped without copying so the stages sort them in place; lists of all-int or
+# all-float values are copied in and must be written back.
+def _numpy_values(np, arr):
+    try:
+        if isinstance(arr, list):
+            if len(set(map(type, arr))) != 1 or type(arr[0]) not in (int, float):
+                return None
+            values = np.array(arr)
+        else:
+            values = np.asarray(memoryview(arr))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if values.ndim != 1 or values.dtype.kind not in "iuf" or not values.flags.writeable:
+        return None
+    return values
+
+# Compare-exchange values (1-D, or 2-D with one row per position) through NumPy
+# stages. np.minimum and np.maximum are fastest, but they copy a NaN into both
+# outputs, so float input holding NaN exchanges through a mask that only ever moves
+# values, like the Python loop.
+def _apply_numpy_stages(np, values, stages):
+    if values.dtype.kind == "f" and np.isnan(values).any():
+        for lows, highs in stages:
+            a = values[lows]
+            b = values[highs]
+            swap = a > b
+            values[lows] = np.where(swap, b, a)
+            values[highs] = np.where(swap, a, b)
+        return
+    for lows, highs in stages:
+        a = values[lows]
+        b = values[highs]
+        values[lows] = np.minimum(a, b)
+        values[highs] = np.maximum(a, b)
+
+# vectorized=False forces the pure Python loop, for comparison
+def _network_sort(arr, stage_function, vectorized=True):
+    n = len(arr)
+    np = _numpy() if vectorized and n >= NUMPY_MIN_SIZE else None
+    values = _numpy_values(np, arr) if np is not None else None
+    if values is None:
+        for lows, highs in stage_function(n):
+            for lo, hi in zip(lows, highs):
+                if arr[lo] > arr[hi]:
+                    arr[lo], arr[hi] = arr[hi], arr[lo]
+        return arr
+
+    _apply_numpy_stages(np, values, _numpy_stages(stage_function, n))
+    if isinstance(arr, list):
+        arr[:] = values.tolist()
+    return arr
+
+# Each step highlights every pair in the stage; accesses count two reads per
+# comparator and two writes per exchange.
+def _network_steps(arr, stage_function):
+    for lows, highs in stage_function(len(arr)):
+        exchanged = 0
+        for lo, hi in zip(lows, highs):
+            if arr[lo] > arr[hi]:
+                arr[lo], arr[hi] = arr[hi], arr[lo]
+                exchanged += 1
+        yield list(lows), list(highs), exchanged > 0, 2 * len(lows) + 2 * exchanged
+
+@keyed_generator
+def bitonic_sort(arr):
+    return _network_steps(arr, bitonic_stages)
+
+@keyed_generator
+def odd_even_merge_sort(arr):
+    return _network_steps(arr, odd_even_merge_stages)
+
+@keyed_sort
+def bitonic_sort_no_yield(arr, vectorized=True):
+    return _network_sort(arr, bitonic_stages, vectorized)
+
+@keyed_sort
+def odd_even_merge_sort_no_yield(arr, vectorized=True):
+    return _network_sort(arr, odd_even_merge_stages, vectorized)
+
+# Presortedness measurement and automatic algorithm choice
+
+# Cheaply describe how sorted arr already is. Runs are counted exactly with one pass of
+# adjacent comparisons; inversions and duplicates are estimated from sample_size random
+# pairs and values. The sample is seeded by the length, so the same array always gets
+# the same profile.
+def measure_presortedness(arr, sample_size=256):
+    n = len(arr)
+    profile = {"size": n, "runs": 1 if n else 0, "inversion_ratio": 0.0, "inversions": 0, "duplicate_ratio": 0.0}
+    if n < 2:
+        return profile
+
+    # A run ends wherever the next element is smaller
+    profile["runs"] = sum(map(operator.lt, itertools.islice(arr, 1, None), arr)) + 1
+
+    rng = random.Random(n)
+    inverted = 0
+    for _ in range(sample_size):
+        i = rng.randrange(n - 1)
+        j = rng.randrange(i + 1, n)
+        if arr[j] < arr[i]:
+            inverted += 1
+    profile["inversion_ratio"] = inverted / sample_size
+    profile["inversions"] = round(profile["inversion_ratio"] * n * (n - 1) / 2)
+
+    # Sorting the sample only needs comparisons, so unhashable values work too
+    sample = sorted(arr[i] for i in rng.sample(range(n), min(n, sample_size // 2)))
+    repeats = sum(1 for k in range(1, len(sample)) if not sample[k - 1] < sample[k])
+    profile["duplicate_ratio"] = repeats / len(sample)
+    return profile
+
+# Pick the algorithm expected to be fastest for a presortedness profile, based on the
+# 'sortBenchmark.py auto' measurements. The fast quick sort uses a middle pivot and a
+# three-way partition, but the visual one pivots on the last element, so with
+# use_yield it is avoided on presorted and duplicate-heavy inputs.
+# Returns (algorithm name, human readable reason).
+def choose_algorithm(profile, use_yield=True):
+    n = profile["size"]
+    ratio = profile["inversion_ratio"]
+    percent = f"~{ratio:.0%} of pairs inverted"
+    runs = f"{profile['runs']} run{'' if profile['runs'] == 1 else 's'}"
+
+    if n <= 32:
+        return "Insertion Sort", f"small input (n={n})"
+    if profile["inversions"] <= 2 * n and profile["runs"] <= max(2, n // 100):
+        return "Insertion Sort", f"nearly sorted ({runs}, {percent})"
+    if ratio <= 0.1 or ratio >= 0.9:
+        direction = "sorted" if ratio <= 0.1 else "reversed"
+        return ("Shell Sort" if use_yield else "Quick Sort"), f"mostly {direction} ({runs}, {percent})"
+    if profile["duplicate_ratio"] >= 0.5:
+        reason = f"many duplicates (~{profile['duplicate_ratio']:.0%} of sampled values repeat)"
+        return ("Merge Sort" if use_yield else "Quick Sort"), reason
+    return "Quick Sort", f"unordered ({percent})"
+
+@keyed_generator
+def auto_sort(arr):
+    name, _ = choose_algorithm(measure_presortedness(arr))
+    yield from get_algorithm_by_name(name)(arr)
+
+@keyed_sort
+def auto_sort_no_yield(arr):
+    name, _ = choose_algorithm(measure_presortedness(arr), use_yield=False)
+    return get_algorithm_by_name(name, False)(arr)
+
+# Partial sorting and selection
+#
+# These do less work than a full sort when only part of the order is needed:
+# - Partial Sort and Top-K leave the k smallest elements in arr[:k] in sorted order,
+#   with the rest in arr[k:] in no particular order. Partial Sort selects the k-th
+#   element and then sorts the prefix, O(n + k log k); Top-K keeps a max-heap of the
+#   k smallest seen so far in the prefix, O(n log k).
+# - Nth Element puts the element that belongs at index k there, with nothing larger
+#   before it and nothing smaller after it.
+# Without k, Partial Sort and Top-K keep the smallest tenth and Nth Element finds
+# the median.
+
+def _partial_count(arr, k):
+    n = len(arr)
+    return n // 10 if k is None else min(max(k, 0), n)
+
+def _nth_index(arr, k):
+    n = len(arr)
+    return n // 2 if k is None else min(max(k, 0), n - 1)
+
+# Index of the median of arr[a], arr[b] and arr[c]
+def _median_of_three(arr, a, b, c):
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+# The k-th smallest of a list of values by median of medians (BFPRT), in guaranteed
+# linear time
+def _select_value(values, k):
+    while len(values) > 5:
+        medians = [sorted(values[i:i + 5])[(min(5, len(values) - i) - 1) // 2] for i in range(0, len(values), 5)]
+        pivot = _select_value(medians, len(medians) // 2)
+        smaller = [value for value in values if value < pivot]
+        if k < len(smaller):
+            values = smaller
+            continue
+        equal = sum(1 for value in values if value == pivot)
+        if k < len(smaller) + equal:
+            return pivot
+        values = [value for value in values if pivot < value]
+        k -= len(smaller) + equal
+    return sorted(values)[k]
+
+# Pivot index for introselect. Median of three is used until the partition budget
+# runs out, then the median of medians of the range, which always discards at least
+# 30% of it and bounds the whole selection to linear time.
+def _select_pivot(arr, low, high, use_medians):
+    if not use_medians:
+        return _median_of_three(arr, low, (low + high) // 2, high)
+    medians = []
+    for start in range(low, high + 1, 5):
+        group = sorted(arr[i] for i in range(start, min(start + 5, high + 1)))
+        medians.append(group[(len(group) - 1) // 2])
+    pivot = _select_value(medians, len(medians) // 2)
+    for i in range(low, high + 1):
+        if arr[i] == pivot:
+            return i
+
+# Partitions allowed before introselect falls back to median of medians pivots
+def _partition_budget(size):
+    return 2 * size.bit_length()
+
+# Rearrange arr[low:high + 1] so arr[k] holds its sorted value, with three-way
+# partitions that narrow onto k
+def _introselect(arr, low, high, k):
+    budget = _partition_budget(high - low + 1)
+    while low < high:
+        pivot = arr[_select_pivot(arr, low, high, budget <= 0)]
+        budget -= 1
+        lt, i, gt = low, low, high
+        while i <= gt:
+            value = arr[i]
+            if value < pivot:
+                arr[lt], arr[i] = value, arr[lt]
+                lt += 1
+                i += 1
+            elif value > pivot:
+                arr[gt], arr[i] = value, arr[gt]
+                gt -= 1
+            else:
+                i += 1
+        if k < lt:
+            high = lt - 1
+        elif k > gt:
+            low = gt + 1
+        else:
+            return
+
+# The same selection as a visual generator. The pivot is swapped to the front of the
+# range, where the three-way partition keeps it at the start of the equal block.
+def _introselect_steps(arr, low, high, k):
+    budget = _partition_budget(high - low + 1)
+    while low < high:
+        p = _select_pivot(arr, low, high, budget <= 0)
+        budget -= 1
+        if p != low:
+            arr[low], arr[p] = arr[p], arr[low]
+            yield low, p, True, 4  # Move the pivot to the front
+        pivot = arr[low]
+        lt, i, gt = low, low + 1, high
+        while i <= gt:
+            yield i, lt, False, 2  # Comparison with the pivot
+            if arr[i] < pivot:
+                arr[lt], arr[i] = arr[i], arr[lt]
+                yield lt, i, True, 4  # Swap into the smaller block
+                lt += 1
+                i += 1
+            elif arr[i] > pivot:
+                arr[gt], arr[i] = arr[i], arr[gt]
+                yield i, gt, True, 4  # Swap into the larger block
+                gt -= 1
+            else:
+                i += 1
+        if k < lt:
+            high = lt - 1
+        elif k > gt:
+            low = gt + 1
+        else:
+            return
+
+# Sift arr[i] down a max-heap of heap_size elements, yielding each step
+def _sift_down_steps(arr, i, heap_size):
+    while True:
+        largest = i
+        l = 2 * i + 1
+        r = 2 * i + 2
+        if l < heap_size:
+            yield i, l, False, 2  # Comparison
+            if arr[l] > arr[largest]:
+                largest = l
+        if r < heap_size:
+            yield largest, r, False, 2  # Comparison
+            if arr[r] > arr[largest]:
+                largest = r
+        if largest == i:
+            return
+        arr[i], arr[largest] = arr[largest], arr[i]
+        yield i, largest, True, 4  # Swap
+        i = largest
+
+def _sift_down(arr, i, heap_size):
+    while True:
+        largest = i
+        l = 2 * i + 1
+        r = 2 * i + 2
+        if l < heap_size and arr[l] > arr[largest]:
+            largest = l
+        if r < heap_size and arr[r] > arr[largest]:
+            largest = r
+        if largest == i:
+            return
+        arr[i], arr[largest] = arr[largest], arr[i]
+        i = largest
+
+@keyed_generator
+def partial_sort(arr, k=None):
+    k = _partial_count(arr, k)
+    if k == 0:
+        return
+    if k < len(arr):
+        yield from _introselect_steps(arr, 0, len(arr) - 1, k - 1)
+    yield from _quick_sort_steps(arr, 0, k - 1)
+
+@keyed_generator
+def top_k(arr, k=None):
+    k = _partial_count(arr, k)
+    for i in range(k // 2 - 1, -1, -1):
+        yield from _sift_down_steps(arr, i, k)
+    # Anything smaller than the largest kept element replaces it
+    if k:
+        for i in range(k, len(arr)):
+            yield i, 0, False, 2  # Comparison with the heap top
+            if arr[i] < arr[0]:
+                arr[0], arr[i] = arr[i], arr[0]
+                yield 0, i, True, 4  # Swap into the heap
+                yield from _sift_down_steps(arr, 0, k)
+    for end in range(k - 1, 0, -1):
+        arr[0], arr[end] = arr[end], arr[0]
+        yield end, 0, True, 4  # Swap
+        yield from _sift_down_steps(arr, 0, end)
+
+@keyed_generator
+def nth_element(arr, k=None):
+    if len(arr) > 1:
+        yield from _introselect_steps(arr, 0, len(arr) - 1, _nth_index(arr, k))
+
+@keyed_sort
+def partial_sort_no_yield(arr, k=None):
+    k = _partial_count(arr, k)
+    if k == 0:
+        return arr
+    if k < len(arr):
+        _introselect(arr, 0, len(arr) - 1, k - 1)
+    return sort_range(quick_sort_no_yield, arr, 0, k)
+
+@keyed_sort
+def top_k_no_yield(arr, k=None):
+    k = _partial_count(arr, k)
+    for i in range(k // 2 - 1, -1, -1):
+        _sift_down(arr, i, k)
+    if k:
+        for i in range(k, len(arr)):
+            if arr[i] < arr[0]:
+                arr[0], arr[i] = arr[i], arr[0]
+                _sift_down(arr, 0, k)
+    for end in range(k - 1, 0, -1):
+        arr[0], arr[end] = arr[end], arr[0]
+        _sift_down(arr, 0, end)
+    return arr
+
+@keyed_sort
+def nth_element_no_yield(arr, k=None):
+    if len(arr) > 1:
+        _introselect(arr, 0, len(arr) - 1, _nth_index(arr, k))
+    return arr
+
+# Batch sorting
+#
+# sort_batch sorts many small arrays in one call. With an algorithm name every array
+# goes through that fast function, with the lookup and key= wrapper done once for
+# the batch. Without one, arrays take the paths that are fastest at small n:
+# - Equal-length lists of plain ints or floats, from BATCH_NUMPY_MIN_SIZE elements,
+#   are stacked into one 2-D NumPy block per length, and each odd-even merge stage
+#   compare-exchanges a pair of positions for every array at once. The block is the
+#   only scratch space the group needs.
+# - Anything else of up to BATCH_NETWORK_MAX_SIZE elements runs the same network as
+#   a flat, cached comparator list, which beats insertion sort in Python from n = 8.
+# - Larger arrays fall back to quick sort.
+
+BATCH_NETWORK_MAX_SIZE = 64
+
+# Below these array lengths and group sizes, copying into a NumPy block costs more
+# than it saves
+BATCH_NUMPY_MIN_SIZE = 16
+BATCH_NUMPY_MIN_ARRAYS = 16
+
+@functools.lru_cache(maxsize=None)
+def _comparators(n):
+    return tuple(pair for lows, highs in odd_even_merge_stages(n) for pair in zip(lows, highs))
+
+def _comparator_sort(arr, comparators):
+    for lo, hi in comparators:
+        a = arr[lo]
+        b = arr[hi]
+        if b < a:
+            arr[lo] = b
+            arr[hi] = a
+
+# Sort equal-length lists as the rows of one NumPy block. Returns False, leaving the
+# lists untouched, unless they all hold plain numbers of a single type.
+def _sort_rows(np, group, n):
+    if not all(isinstance(arr, list) for arr in group):
+        return False
+    types = set(map(type, itertools.chain.from_iterable(group)))
+    if len(types) != 1 or not types <= {int, float}:
+        return False
+    try:
+        values = np.array(group)
+    except OverflowError:
+        return False
+    if values.dtype.kind not in "if":
+        return False
+
+    # One row per position, so each stage gathers whole contiguous rows
+    values = np.ascontiguousarray(values.T)
+    _apply_numpy_stages(np, values, _numpy_stages(odd_even_merge_stages, n))
+    for arr, row in zip(group, np.ascontiguousarray(values.T).tolist()):
+        arr[:] = row
+    return True
+
+def _sort_small_arrays(arrays):
+    groups = {}
+    for arr in arrays:
+        if len(arr) > 1:
+            groups.setdefault(len(arr), []).append(arr)
+
+    np = _numpy()
+    fallback = getattr(quick_sort_no_yield, "__wrapped__", quick_sort_no_yield)
+    for n, group in groups.items():
+        use_numpy = np is not None and n >= BATCH_NUMPY_MIN_SIZE and len(group) >= BATCH_NUMPY_MIN_ARRAYS
+        if use_numpy and _sort_rows(np, group, n):
+            continue
+        if n <= BATCH_NETWORK_MAX_SIZE:
+            comparators = _comparators(n)
+            for arr in group:
+                _comparator_sort(arr, comparators)
+        else:
+            for arr in group:
+                fallback(arr)
+
+# Process pool worker: sort one chunk of a batch and send it back
+def _sort_batch_chunk(chunk, algorithm, key, reverse):
+    return sort_batch(chunk, algorithm, key=key, reverse=reverse)
+
+# Sort every array in arrays in place and return arrays. algorithm is an algorithm
+# name, or None for the small-n paths above. With processes > 1 the batch is split
+# into chunks sorted in a process pool, which only pays off for large batches since
+# every array is pickled both ways; the arrays and key must be picklable, so a
+# lambda key raises ValueError there.
+def sort_batch(arrays, algorithm=None, processes=None, key=None, reverse=False):
+    if processes is not None and processes > 1 and len(arrays) > 1:
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+
+        try:
+            pickle.dumps(key)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError(f"key must be picklable to sort with processes: {e}") from None
+
+        chunk_count = min(len(arrays), processes * 4)
+        chunk_size = -(-len(arrays) // chunk_count)
+        chunks = [arrays[start:start + chunk_size] for start in range(0, len(arrays), chunk_size)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            sorted_chunks = executor.map(
+                _sort_batch_chunk, chunks, itertools.repeat(algorithm), itertools.repeat(key), itertools.repeat(reverse)
+            )
+            for chunk, sorted_chunk in zip(chunks, sorted_chunks):
+                for arr, sorted_arr in zip(chunk, sorted_chunk):
+                    arr[:] = sorted_arr
+        return arrays
+
+    if key is not None or reverse:
+        sorting_function = get_algorithm_by_name(algorithm or "Quick Sort", False)
+        for arr in arrays:
+            sorting_function(arr, key=key, reverse=reverse)
+    elif algorithm is None:
+        _sort_small_arrays(arrays)
+    else:
+        sorting_function = get_algorithm_by_name(algorithm, False)
+        sorting_function = getattr(sorting_function, "__wrapped__", sorting_function)
+        for arr in arrays:
+            sorting_function(arr)
+    return arrays
+
+# Sortedness tracking
+
+# Map each distinct value to a 1-based rank for indexing Fenwick trees
+def _value_ranks(values):
+    return {value: rank for rank, value in enumerate(sorted(set(values)), 1)}
+
+# Number of pairs i < j with arr[i] > arr[j], in O(n log n) with a Fenwick tree over value ranks.
+def count_inversions(arr):
+    ranks = _value_ranks(arr)
+    tree = [0] * (len(ranks) + 1)
+    inversions = 0
+    for seen, value in enumerate(arr):
+        # Earlier values that are not greater than this one
+        rank = ranks[value]
+        not_greater = 0
+        while rank > 0:
+            not_greater += tree[rank]
+            rank -= rank & -rank
+        inversions += seen - not_greater
+
+        rank = ranks[value]
+        while rank < len(tree):
+            tree[rank] += 1
+            rank += rank & -rank
+    return inversions
+
+# Inversion count of an array, kept current as single positions are overwritten.
+# Swaps and placements are applied one position at a time with update(). Positions
+# are grouped into blocks; a Fenwick tree over blocks, whose nodes are Fenwick trees
+# over value ranks, counts the values before a position in whole blocks, and the
+# rest of the position's own block is scanned. Each update costs
+# O(log(blocks) * log(values) + block_size), with at most 64 blocks of positions.
+# Values written later must come from the initial array, as they do while sorting.
+class InversionCounter:
+    def __init__(self, arr):
+        self.values = list(arr)
+        n = len(self.values)
+        self.ranks = _value_ranks(self.values)
+        self.rank_count = len(self.ranks)
+        self.block_size = max(32, -(-n // 64))
+        self.block_count = -(-n // self.block_size)
+        self.max_inversions = n * (n - 1) // 2
+        self.inversions = count_inversions(self.values)
+
+        # Count of every value rank in the whole array
+        self.totals = self._build_tree(range(n))
+
+        # trees[b] covers the blocks (b - lowbit(b), b] in Fenwick order
+        self.trees = [None]
+        for node in range(1, self.block_count + 1):
+            first_block = node - (node & -node)
+            start = first_block * self.block_size
+            end = min(n, node * self.block_size)
+            self.trees.append(self._build_tree(range(start, end)))
+
+    # Fenwick tree over value ranks counting the values at the given positions, built in linear time
+    def _build_tree(self, positions):
+        tree = [0] * (self.rank_count + 1)
+        for pos in positions:
+            tree[self.ranks[self.values[pos]]] += 1
+        for i in range(1, self.rank_count + 1):
+            parent = i + (i & -i)
+            if parent <= self.rank_count:
+                tree[parent] += tree[i]
+        return tree
+
+    @staticmethod
+    def _tree_add(tree, rank, delta):
+        while rank < len(tree):
+            tree[rank] += delta
+            rank += rank & -rank
+
+    @staticmethod
+    def _tree_prefix(tree, rank):
+        total = 0
+        while rank > 0:
+            total += tree[rank]
+            rank -= rank & -rank
+        return total
+
+    # Number of values with rank at most rank in the whole blocks before block
+    def _count_in_blocks(self, block, rank):
+        counted = 0
+        while block > 0:
+            counted += self._tree_prefix(self.trees[block], rank)
+            block -= block & -block
+        return counted
+
+    # Inversions between position pos, holding value, and every other position.
+    # pos itself must not be counted in the trees.
+    def _pairs_with(self, pos, value):
+        rank = self.ranks[value]
+        block = pos // self.block_size
+        partial = self.values[block * self.block_size:pos]
+
+        greater_before = (
+            block * self.block_size - self._count_in_blocks(block, rank)
+            + sum(map(operator.lt, itertools.repeat(value), partial))
+        )
+        less_before = (
+            self._count_in_blocks(block, rank - 1)
+            + sum(map(operator.gt, itertools.repeat(value), partial))
+        )
+        less_after = self._tree_prefix(self.totals, rank - 1) - less_before
+        return greater_before + less_after
+
+    def _move(self, pos, value, delta):
+        rank = self.ranks[value]
+        self._tree_add(self.totals, rank, delta)
+        node = pos // self.block_size + 1
+        while node <= self.block_count:
+            self._tree_add(self.trees[node], rank, delta)
+            node += node & -node
+
+    # Record that arr[pos] now holds value
+    def update(self, pos, value):
+        old = self.values[pos]
+        if old == value:
+            return
+        self._move(pos, old, -1)
+        self.inversions -= self._pairs_with(pos, old)
+        self.values[pos] = value
+        self.inversions += self._pairs_with(pos, value)
+        self._move(pos, value, 1)
+
+    # Percentage of pairs in order, 100 when sorted
+    def sorted_percent(self):
+        if self.max_inversions == 0:
+            return 100.0
+        return 100.0 * (1 - self.inversions / self.max_inversions)
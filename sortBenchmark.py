@@ -0,0 +1,834 @@
+import argparse
+import collections
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import sortAlgorithms
+from sortAlgorithms import (
+    ALGORITHM_NAMES, PARTIAL_ALGORITHM_NAMES, bitonic_stages, choose_algorithm, get_algorithm_by_name, measure_presortedness,
+    heap_sort, heap_sort_recursive, merge_sort, merge_sort_recursive, odd_even_merge_stages, quick_sort,
+    quick_sort_recursive, sort_batch
+)
+
+# Number of most recent measurements used to fit the growth curve
+GROWTH_FIT_WINDOW = 3
+
+# Run a sorting function once on arr and return the runtime in milliseconds.
+def time_sort(sorting_function, arr):
+    start_time = time.perf_counter()
+    sorting_function(arr)
+    end_time = time.perf_counter()
+    return (end_time - start_time) * 1000
+
+# Predict the runtime at next_size by fitting runtime = c * n^k to the most
+# recent measurements on a log-log scale. Returns None if there is not enough data.
+def predict_runtime(sizes, runtimes, next_size, window=GROWTH_FIT_WINDOW):
+    points = [(size, runtime) for size, runtime in zip(sizes, runtimes) if size > 0 and runtime > 0]
+    points = points[-window:]
+    if len(points) < 2:
+        return None
+
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(runtime) for _, runtime in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+    # Timer noise at small sizes can produce nonsense exponents; no sort is
+    # sub-linear and none of ours is worse than cubic.
+    slope = min(max(slope, 1.0), 3.0)
+
+    last_size, last_runtime = points[-1]
+    return last_runtime * (next_size / last_size) ** slope
+
+# Input distributions for benchmark arrays. Each takes a size and a random.Random.
+def nearly_sorted_input(size, rng):
+    arr = list(range(size))
+    for _ in range(max(1, size // 100)):
+        if size > 1:
+            i, j = rng.randrange(size), rng.randrange(size)
+            arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+DISTRIBUTIONS = {
+    "random": lambda size, rng: rng.sample(range(size), size),
+    "sorted": lambda size, rng: list(range(size)),
+    "reversed": lambda size, rng: list(range(size - 1, -1, -1)),
+    "nearly_sorted": nearly_sorted_input,
+    "few_unique": lambda size, rng: [rng.randrange(10) for _ in range(size)],
+}
+
+def make_input(distribution, size, rng=random):
+    return DISTRIBUTIONS[distribution](size, rng)
+
+# Benchmark one algorithm over increasing sizes, building each input with
+# make_arr(size). If time_budget_ms is set, the series stops as soon as a cell
+# exceeds the budget or the fitted growth predicts that the next size will.
+# progress(size), if given, is called after each size is run.
+# Returns (runtimes, truncated_at) where truncated_at is the last size run, or
+# None if every size was run.
+def run_series(sorting_function, sizes, make_arr, time_budget_ms=None, progress=None):
+    runtimes = []
+    for idx, size in enumerate(sizes):
+        runtimes.append(time_sort(sorting_function, make_arr(size)))
+        if progress is not None:
+            progress(size)
+
+        if time_budget_ms is None or idx + 1 == len(sizes):
+            continue
+
+        predicted = predict_runtime(sizes[:idx + 1], runtimes, sizes[idx + 1])
+        if runtimes[-1] > time_budget_ms or (predicted is not None and predicted > time_budget_ms):
+            return runtimes, size
+
+    return runtimes, None
+
+# Fast function for an algorithm. Partial operations are given k as a fraction of
+# each array's length when k_fraction is set, and use their default k otherwise.
+def benchmark_function(algo_name, k_fraction=None):
+    sorting_function = get_algorithm_by_name(algo_name, False)
+    if k_fraction is None or algo_name not in PARTIAL_ALGORITHM_NAMES:
+        return sorting_function
+    return lambda arr: sorting_function(arr, k=int(k_fraction * len(arr)))
+
+# Benchmark each algorithm over increasing sizes on random permutations.
+# Returns (runtimes_dict, truncated_dict) where truncated_dict maps each
+# algorithm to the last size it was run at, or None if it ran every size.
+def run_sweep(algorithm_names, sizes, time_budget_ms=None, distribution="random", k_fraction=None):
+    runtimes_dict = {}
+    truncated_dict = {}
+
+    for algo_name in algorithm_names:
+        sorting_function = benchmark_function(algo_name, k_fraction)
+        runtimes_dict[algo_name], truncated_dict[algo_name] = run_series(
+            sorting_function, sizes, lambda size: make_input(distribution, size), time_budget_ms
+        )
+
+    return runtimes_dict, truncated_dict
+
+# Sharded sweeps
+#
+# A sweep is described by a JSON job spec. Its work units, one size series per
+# (algorithm, distribution, trial), are dealt round-robin into shards that can run
+# on different machines with 'sortBenchmark.py run'. Shard results are merged
+# back into one dataset that the benchmark window can open.
+
+# k_fraction sets k for the partial operations as in run_sweep. It is part of the
+# spec, so it is covered by spec_id and shards run with different k never merge.
+def make_job_spec(algorithms, sizes, distributions=("random",), trials=1, time_budget_ms=None, seed=0,
+                  k_fraction=None):
+    unknown = [name for name in algorithms if name not in ALGORITHM_NAMES + PARTIAL_ALGORITHM_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown algorithms: {', '.join(unknown)}")
+    unknown = [name for name in distributions if name not in DISTRIBUTIONS]
+    if unknown:
+        raise ValueError(f"Unknown distributions: {', '.join(unknown)}")
+    return {
+        "version": 1,
+        "algorithms": list(algorithms),
+        "sizes": sorted(sizes),
+        "distributions": list(distributions),
+        "trials": trials,
+        "time_budget_ms": time_budget_ms,
+        "seed": seed,
+        "k_fraction": k_fraction,
+    }
+
+# Stable identifier of a spec, used to refuse merging shards of different sweeps
+def spec_id(spec):
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+
+def spec_units(spec):
+    return [
+        {"algorithm": algo_name, "distribution": distribution, "trial": trial}
+        for trial in range(spec["trials"])
+        for distribution in spec["distributions"]
+        for algo_name in spec["algorithms"]
+    ]
+
+def shard_units(spec, shard_index, shard_count):
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard {shard_index} is out of range for {shard_count} shards")
+    return spec_units(spec)[shard_index::shard_count]
+
+# Inputs depend only on the spec seed, distribution, trial and size, so every
+# algorithm sorts the same arrays whichever shard or machine runs it.
+def unit_input(spec, unit, size):
+    rng = random.Random(f"{spec['seed']}:{unit['distribution']}:{unit['trial']}:{size}")
+    return make_input(unit["distribution"], size, rng)
+
+MACHINE_ALIASES = {"amd64": "x86_64", "x64": "x86_64", "aarch64": "arm64", "armv8": "arm64"}
+
+# Normalize host metadata so shards reported by different platforms agree on spelling
+def normalize_host(host):
+    machine = str(host.get("machine", "")).lower()
+    return {
+        "hostname": str(host.get("hostname", "")).lower().split(".")[0],
+        "system": str(host.get("system", "")).lower(),
+        "machine": MACHINE_ALIASES.get(machine, machine),
+        "python": " ".join(str(host.get("python", "")).split()),
+        "cpu_count": int(host.get("cpu_count") or 0),
+    }
+
+def host_metadata():
+    return normalize_host({
+        "hostname": platform.node(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "cpu_count": os.cpu_count(),
+    })
+
+# Run the units of one shard. progress(cells_done, cells_total), if given, is called
+# after every (unit, size) cell; sizes skipped by the time budget count as done. An
+# exception raised by progress stops the shard.
+def run_shard(spec, shard_index=0, shard_count=1, progress=None):
+    results = []
+    truncated = []
+    units = shard_units(spec, shard_index, shard_count)
+    cells_total = len(units) * len(spec["sizes"])
+    cells_done = 0
+
+    def report(size=None):
+        nonlocal cells_done
+        cells_done += 1
+        progress(cells_done, cells_total)
+
+    for unit_index, unit in enumerate(units):
+        # Specs written before k_fraction was added use the default k
+        sorting_function = benchmark_function(unit["algorithm"], spec.get("k_fraction"))
+        runtimes, truncated_at = run_series(
+            sorting_function, spec["sizes"], lambda size: unit_input(spec, unit, size), spec["time_budget_ms"],
+            report if progress is not None else None
+        )
+        if progress is not None and cells_done < (unit_index + 1) * len(spec["sizes"]):
+            cells_done = (unit_index + 1) * len(spec["sizes"])
+            progress(cells_done, cells_total)
+        for size, runtime in zip(spec["sizes"], runtimes):
+            results.append(dict(unit, size=size, runtime_ms=runtime))
+        if truncated_at is not None:
+            truncated.append(dict(unit, size=truncated_at))
+
+    return {
+        "spec": spec,
+        "spec_id": spec_id(spec),
+        "shard": [shard_index, shard_count],
+        "host": host_metadata(),
+        "results": results,
+        "truncated": truncated,
+    }
+
+# Merge shard results into one dataset. Hosts are normalized and stored once, and
+# each result row refers to its host by index. Raises ValueError if the shards come
+# from different specs or shard counts, or if a shard is missing or duplicated.
+def merge_shards(shard_results):
+    if not shard_results:
+        raise ValueError("No shard results to merge")
+
+    spec = shard_results[0]["spec"]
+    shard_count = shard_results[0]["shard"][1]
+    seen = set()
+    for shard in shard_results:
+        if spec_id(shard["spec"]) != spec_id(spec):
+            raise ValueError("Shard results come from different job specs")
+        shard_index, count = shard["shard"]
+        if count != shard_count:
+            raise ValueError(f"Shard {shard_index} was cut into {count} shards, expected {shard_count}")
+        if shard_index in seen:
+            raise ValueError(f"Shard {shard_index} appears more than once")
+        seen.add(shard_index)
+    missing = sorted(set(range(shard_count)) - seen)
+    if missing:
+        raise ValueError(f"Missing shards: {', '.join(str(i) for i in missing)}")
+
+    hosts = []
+    results = []
+    truncated = []
+    for shard in sorted(shard_results, key=lambda shard: shard["shard"][0]):
+        host = normalize_host(shard["host"])
+        if host not in hosts:
+            hosts.append(host)
+        host_index = hosts.index(host)
+        results.extend(dict(row, host=host_index) for row in shard["results"])
+        truncated.extend(shard["truncated"])
+
+    return {
+        "spec": spec,
+        "spec_id": spec_id(spec),
+        "hosts": hosts,
+        "results": results,
+        "truncated": truncated,
+    }
+
+# Run every shard in a local process pool and merge them, standing in for a cluster.
+def run_sharded_locally(spec, shard_count, processes=None):
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(run_shard, spec, index, shard_count) for index in range(shard_count)]
+        return merge_shards([future.result() for future in futures])
+
+# Reduce a merged dataset to the chart inputs of QChartWindow. Trials are combined
+# by their median; each (algorithm, distribution) becomes one series, named after
+# the algorithm alone when the sweep used a single distribution.
+# Returns (sizes, runtimes_dict, series_names, truncated_dict).
+def dataset_series(dataset):
+    spec = dataset["spec"]
+    sizes = spec["sizes"]
+
+    def series_name(algo_name, distribution):
+        if len(spec["distributions"]) == 1:
+            return algo_name
+        return f"{algo_name} ({distribution})"
+
+    samples = {}
+    for row in dataset["results"]:
+        name = series_name(row["algorithm"], row["distribution"])
+        samples.setdefault(name, {}).setdefault(row["size"], []).append(row["runtime_ms"])
+
+    truncated_trials = {}
+    for row in dataset["truncated"]:
+        name = series_name(row["algorithm"], row["distribution"])
+        truncated_trials.setdefault(name, []).append(row["size"])
+
+    series_names = [
+        series_name(algo_name, distribution)
+        for distribution in spec["distributions"]
+        for algo_name in spec["algorithms"]
+    ]
+    runtimes_dict = {}
+    truncated_dict = {}
+    for name in series_names:
+        by_size = samples.get(name, {})
+        # A series stops at the first size no trial reached
+        runtimes = []
+        for size in sizes:
+            if size not in by_size:
+                break
+            runtimes.append(statistics.median(by_size[size]))
+        runtimes_dict[name] = runtimes
+
+        # Only marked as truncated if every trial was cut off
+        cutoffs = truncated_trials.get(name, [])
+        truncated_dict[name] = max(cutoffs) if len(cutoffs) == spec["trials"] else None
+
+    return sizes, runtimes_dict, series_names, truncated_dict
+
+# The (algorithm, distribution) behind a chart series name from dataset_series
+def series_target(series_name):
+    algo_name, _, rest = series_name.rpartition(" (")
+    if algo_name and rest.endswith(")") and rest[:-1] in DISTRIBUTIONS:
+        return algo_name, rest[:-1]
+    return series_name, "random"
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def save_json(data, path):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+# Key function benchmark
+
+# Baseline for key benchmarks: calls the key on both operands of every comparison,
+# the way a comparison wrapper without precomputed keys would.
+class PerComparisonKey:
+    __slots__ = ("value", "key")
+
+    def __init__(self, value, key):
+        self.value = value
+        self.key = key
+
+    def __eq__(self, other):
+        return self.key(self.value) == other.key(other.value)
+
+    def __lt__(self, other):
+        return self.key(self.value) < other.key(other.value)
+
+    def __le__(self, other):
+        return self.key(self.value) <= other.key(other.value)
+
+    def __gt__(self, other):
+        return self.key(self.value) > other.key(other.value)
+
+    def __ge__(self, other):
+        return self.key(self.value) >= other.key(other.value)
+
+# A deliberately costly key over the records made by make_records
+def expensive_key(record):
+    return sum(field * field for field in record)
+
+def make_records(size, fields=8):
+    return [tuple(random.randrange(1000) for _ in range(fields)) for _ in range(size)]
+
+# Compare key= (keys computed once per element) against calling the key inside
+# every comparison. Returns {algorithm: {"decorated": [...], "per_comparison": [...]}}
+# with runtimes in milliseconds for each size.
+def run_key_benchmark(algorithm_names, sizes, key=expensive_key):
+    results = {}
+    for algo_name in algorithm_names:
+        sorting_function = get_algorithm_by_name(algo_name, False)
+        decorated_runtimes = []
+        per_comparison_runtimes = []
+
+        for size in sizes:
+            records = make_records(size)
+
+            start_time = time.perf_counter()
+            sorting_function(list(records), key=key)
+            decorated_runtimes.append((time.perf_counter() - start_time) * 1000)
+
+            start_time = time.perf_counter()
+            sorting_function([PerComparisonKey(record, key) for record in records])
+            per_comparison_runtimes.append((time.perf_counter() - start_time) * 1000)
+
+        results[algo_name] = {
+            "decorated": decorated_runtimes,
+            "per_comparison": per_comparison_runtimes,
+        }
+    return results
+
+# Auto sort benchmark
+
+# Time Auto Sort against always using each fixed algorithm, on the same seeded input
+# for every distribution. Returns {distribution: {"choice": name, "reason": text,
+# "runtimes": {algorithm: ms}}}, where the runtimes include "Auto Sort" itself.
+def run_auto_benchmark(algorithm_names, size, distributions=tuple(DISTRIBUTIONS), seed=0):
+    results = {}
+    for distribution in distributions:
+        data = make_input(distribution, size, random.Random(f"{seed}:{distribution}"))
+        choice, reason = choose_algorithm(measure_presortedness(data), use_yield=False)
+        runtimes = {}
+        for algo_name in algorithm_names:
+            runtimes[algo_name] = time_sort(get_algorithm_by_name(algo_name, False), list(data))
+        results[distribution] = {"choice": choice, "reason": reason, "runtimes": runtimes}
+    return results
+
+# Visual generator overhead benchmark
+
+# Recursive reference and flat iterative version of each visual algorithm
+GENERATOR_VERSIONS = {
+    "Merge Sort": {"recursive": merge_sort_recursive, "iterative": merge_sort},
+    "Quick Sort": {"recursive": quick_sort_recursive, "iterative": quick_sort},
+    "Heap Sort": {"recursive": heap_sort_recursive, "iterative": heap_sort},
+}
+
+# Drain a visual generator and return the number of steps it yielded
+def count_events(sort_generator):
+    last = collections.deque(enumerate(sort_generator, 1), maxlen=1)
+    return last[0][0] if last else 0
+
+# Events per second of the recursive and iterative versions of each visual algorithm.
+# Returns a list of rows with events per second for each version, or None where
+# that version hit the recursion limit.
+def run_events_benchmark(algorithm_names, sizes, distributions=("random",), seed=0):
+    rows = []
+    for algo_name in algorithm_names:
+        for distribution in distributions:
+            for size in sizes:
+                data = make_input(distribution, size, random.Random(f"{seed}:{distribution}:{size}"))
+                row = {"algorithm": algo_name, "distribution": distribution, "size": size, "events": 0}
+                for version, sort_generator in GENERATOR_VERSIONS[algo_name].items():
+                    start_time = time.perf_counter()
+                    try:
+                        events = count_events(sort_generator(list(data)))
+                    except RecursionError:
+                        row[version] = None
+                        continue
+                    elapsed = time.perf_counter() - start_time
+                    row["events"] = events
+                    row[version] = events / elapsed if elapsed > 0 else float("inf")
+                rows.append(row)
+    return rows
+
+# Storage backend benchmark
+
+# Containers the fast path can sort, built from an iterable of non-negative ints.
+# bytearray can only hold 0-255, so its values are folded into that range.
+STORAGE_BACKENDS = {
+    "list": list,
+    "array('i')": lambda values: array("i", values),
+    "array('q')": lambda values: array("q", values),
+    "array('d')": lambda values: array("d", values),
+    "bytearray": lambda values: bytearray(value & 0xFF for value in values),
+    "memoryview": lambda values: memoryview(array("q", values)),
+}
+
+# Bytes allocated per element when building a backend, as seen by tracemalloc.
+# For lists this includes the int objects, not just the pointer array.
+def backend_footprint(make_backend, values):
+    tracemalloc.start()
+    try:
+        # Fresh ints past the small int cache, so a list has to keep its own objects
+        container = make_backend(value + 1000 for value in values)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del container
+    return allocated / max(1, len(values))
+
+# Nanoseconds per element to read a backend in index order and in random order.
+# Python cannot read hardware cache counters, so the gap between the two is the
+# stand-in for how well a backend's layout suits the cache at this size.
+def backend_access_times(container, order):
+    start_time = time.perf_counter()
+    total = 0
+    for i in range(len(container)):
+        total += container[i]
+    sequential = (time.perf_counter() - start_time) * 1e9 / max(1, len(container))
+
+    start_time = time.perf_counter()
+    for i in order:
+        total += container[i]
+    scattered = (time.perf_counter() - start_time) * 1e9 / max(1, len(container))
+    return sequential, scattered
+
+# Sort the same data held in each backend. Returns a list of result rows, one per
+# (algorithm, backend, size), with runtime in milliseconds, bytes per element and
+# sequential / random access times in nanoseconds per element.
+def run_backend_benchmark(algorithm_names, sizes, backends=tuple(STORAGE_BACKENDS)):
+    rows = []
+    for size in sizes:
+        values = random.sample(range(size), size)
+        order = random.sample(range(size), size)
+        for backend in backends:
+            make_backend = STORAGE_BACKENDS[backend]
+            bytes_per_element = backend_footprint(make_backend, values)
+            sequential, scattered = backend_access_times(make_backend(values), order)
+            for algo_name in algorithm_names:
+                sorting_function = get_algorithm_by_name(algo_name, False)
+                rows.append({
+                    "algorithm": algo_name,
+                    "backend": backend,
+                    "size": size,
+                    "runtime_ms": time_sort(sorting_function, make_backend(values)),
+                    "bytes_per_element": bytes_per_element,
+                    "sequential_ns": sequential,
+                    "random_ns": scattered,
+                })
+    return rows
+
+# Partial sort benchmark
+
+K_FRACTIONS = [0.001, 0.01, 0.1, 0.25, 0.5, 1.0]
+
+# Runtime in milliseconds of each partial operation on one seeded permutation as
+# k/n varies, next to full sorts of the same array, which do not depend on k.
+# Returns (runtimes_dict, full_sort_dict) with one runtime per fraction.
+def run_partial_benchmark(size, fractions=K_FRACTIONS, algorithm_names=PARTIAL_ALGORITHM_NAMES,
+                          full_sort_names=("Quick Sort", "Merge Sort"), seed=0):
+    data = random.Random(seed).sample(range(size), size)
+    runtimes_dict = {algo_name: [] for algo_name in algorithm_names}
+    for fraction in fractions:
+        for algo_name in algorithm_names:
+            runtimes_dict[algo_name].append(time_sort(benchmark_function(algo_name, fraction), list(data)))
+    full_sort_dict = {
+        algo_name: time_sort(get_algorithm_by_name(algo_name, False), list(data)) for algo_name in full_sort_names
+    }
+    return runtimes_dict, full_sort_dict
+
+# Batch benchmark
+
+BATCH_SIZES = [8, 16, 32, 64]
+
+# Arrays sorted per second for many small arrays: each algorithm called once per
+# array through get_algorithm_by_name ("per call") and through sort_batch ("batch"),
+# then sort_batch's small-n paths, optionally fanned out over a process pool, and
+# list.sort for reference. Every row sorts copies of the same seeded arrays.
+def run_batch_benchmark(sizes=BATCH_SIZES, count=10000, algorithm_names=("Insertion Sort", "Quick Sort", "Merge Sort"),
+                        processes=None, seed=0):
+    rows = []
+    for size in sizes:
+        rng = random.Random(f"{seed}:{size}")
+        data = [rng.sample(range(size * 4), size) for _ in range(count)]
+
+        def arrays_per_second(sort_arrays):
+            arrays = [list(arr) for arr in data]
+            start_time = time.perf_counter()
+            sort_arrays(arrays)
+            elapsed = time.perf_counter() - start_time
+            return count / elapsed if elapsed > 0 else float("inf")
+
+        def add_row(algorithm, mode, sort_arrays):
+            rows.append({"algorithm": algorithm, "mode": mode, "size": size, "arrays_per_second": arrays_per_second(sort_arrays)})
+
+        for algo_name in algorithm_names:
+            sorting_function = get_algorithm_by_name(algo_name, False)
+            add_row(algo_name, "per call", lambda arrays: [sorting_function(arr) for arr in arrays])
+            add_row(algo_name, "batch", lambda arrays: sort_batch(arrays, algo_name))
+        sort_batch([list(arr) for arr in data[:100]])  # Import NumPy and build the stages untimed
+        add_row("Small-n paths", "batch", sort_batch)
+        if processes is not None and processes > 1:
+            add_row("Small-n paths", f"batch, {processes} processes", lambda arrays: sort_batch(arrays, processes=processes))
+        add_row("list.sort", "per call", lambda arrays: [arr.sort() for arr in arrays])
+    return rows
+
+# Sorting network benchmark
+
+NETWORK_ALGORITHMS = {"Bitonic Sort": bitonic_stages, "Odd-Even Merge Sort": odd_even_merge_stages}
+
+# Elements sorted per second by each network, vectorized and as a pure Python loop,
+# next to the sequential algorithms on the same input. Throughput is left as None for
+# the vectorized run when NumPy is not installed.
+def run_network_benchmark(sizes, sequential_names=("Quick Sort", "Merge Sort"), seed=0):
+    numpy_available = sortAlgorithms._numpy() is not None
+    rows = []
+    for size in sizes:
+        data = random.Random(f"{seed}:{size}").sample(range(size), size)
+        for algo_name, stage_function in NETWORK_ALGORITHMS.items():
+            sorting_function = get_algorithm_by_name(algo_name, False)
+            # Build the cached stages before timing
+            stage_function(size)
+            sorting_function(list(data))
+            row = {"algorithm": algo_name, "size": size, "vectorized": None}
+            if numpy_available:
+                row["vectorized"] = size / time_sort(sorting_function, list(data)) * 1000
+            row["python"] = size / time_sort(lambda arr: sorting_function(arr, vectorized=False), list(data)) * 1000
+            rows.append(row)
+        for algo_name in sequential_names:
+            runtime = time_sort(get_algorithm_by_name(algo_name, False), list(data))
+            rows.append({"algorithm": algo_name, "size": size, "vectorized": None, "python": size / runtime * 1000})
+    return rows
+
+# Fixed-seed micro-benchmarks
+
+# Array size used for each algorithm's micro-benchmark; the quadratic sorts get a
+# smaller array so the whole set runs in a few seconds
+MICRO_BENCHMARK_SIZES = {
+    "Bubble Sort": 800,
+    "Selection Sort": 800,
+    "Insertion Sort": 800,
+    "Cocktail Sort": 800,
+}
+MICRO_BENCHMARK_DEFAULT_SIZE = 10000
+
+def micro_benchmark_size(algo_name):
+    return MICRO_BENCHMARK_SIZES.get(algo_name, MICRO_BENCHMARK_DEFAULT_SIZE)
+
+# Best-of-repeats runtime of a fixed pure Python workload in milliseconds. Dividing
+# micro-benchmark runtimes by this makes them roughly comparable across machines.
+def calibration_runtime(repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        total = 0
+        for i in range(200000):
+            total += i * i
+        best = min(best, (time.perf_counter() - start_time) * 1000)
+    return best
+
+# Best-of-repeats runtime in milliseconds of sorting the same seeded permutation.
+def run_micro_benchmark(algo_name, size=None, seed=0, repeats=5):
+    if size is None:
+        size = micro_benchmark_size(algo_name)
+    data = random.Random(seed).sample(range(size), size)
+    sorting_function = get_algorithm_by_name(algo_name, False)
+    return min(time_sort(sorting_function, list(data)) for _ in range(repeats))
+
+# Command line interface
+
+def parse_sizes(max_size, step_size):
+    return list(range(step_size, max_size + 1, step_size))
+
+def print_key_benchmark(args):
+    sizes = parse_sizes(args.max_size, args.step_size)
+    results = run_key_benchmark(args.algorithms, sizes)
+    print(f"{'Algorithm':<16}{'n':>8}{'key= (ms)':>14}{'per-compare (ms)':>18}{'speedup':>10}")
+    for algo_name, runtimes in results.items():
+        for size, decorated, per_comparison in zip(sizes, runtimes["decorated"], runtimes["per_comparison"]):
+            speedup = per_comparison / decorated if decorated > 0 else float("inf")
+            print(f"{algo_name:<16}{size:>8}{decorated:>14.3f}{per_comparison:>18.3f}{speedup:>9.1f}x")
+
+def print_auto_benchmark(args):
+    algorithm_names = list(dict.fromkeys(["Auto Sort"] + args.algorithms))
+    results = run_auto_benchmark(algorithm_names, args.size, args.distributions)
+    print(f"{'Distribution':<15}{'auto (ms)':>11}{'best fixed':>26}{'auto/best':>11}  choice")
+    for distribution, result in results.items():
+        runtimes = result["runtimes"]
+        fixed = {name: runtime for name, runtime in runtimes.items() if name != "Auto Sort"}
+        best = min(fixed, key=fixed.get)
+        best_text = f"{best} {fixed[best]:.2f}"
+        print(
+            f"{distribution:<15}{runtimes['Auto Sort']:>11.2f}{best_text:>26}"
+            f"{runtimes['Auto Sort'] / fixed[best]:>10.2f}x  {result['choice']}: {result['reason']}"
+        )
+
+def print_events_benchmark(args):
+    rows = run_events_benchmark(args.algorithms, args.sizes, args.distributions)
+    print(f"{'Algorithm':<12}{'input':<10}{'n':>7}{'events':>11}{'recursive ev/s':>16}{'iterative ev/s':>16}{'speedup':>9}")
+    for row in rows:
+        recursive = "recursion limit" if row["recursive"] is None else f"{row['recursive']:,.0f}"
+        iterative = "recursion limit" if row["iterative"] is None else f"{row['iterative']:,.0f}"
+        speedup = "-" if None in (row["recursive"], row["iterative"]) else f"{row['iterative'] / row['recursive']:.2f}x"
+        print(
+            f"{row['algorithm']:<12}{row['distribution']:<10}{row['size']:>7}{row['events']:>11,}"
+            f"{recursive:>16}{iterative:>16}{speedup:>9}"
+        )
+
+def print_backend_benchmark(args):
+    rows = run_backend_benchmark(args.algorithms, args.sizes, args.backends)
+    print(f"{'Algorithm':<16}{'backend':<12}{'n':>9}{'sort (ms)':>12}{'B/elem':>9}{'seq ns':>9}{'rand ns':>9}")
+    for row in rows:
+        print(
+            f"{row['algorithm']:<16}{row['backend']:<12}{row['size']:>9}{row['runtime_ms']:>12.2f}"
+            f"{row['bytes_per_element']:>9.1f}{row['sequential_ns']:>9.1f}{row['random_ns']:>9.1f}"
+        )
+
+def print_batch_benchmark(args):
+    rows = run_batch_benchmark(args.sizes, args.count, args.algorithms, args.processes)
+    print(f"{'Algorithm':<16}{'mode':<22}{'n':>5}{'arrays/s':>14}")
+    for row in rows:
+        print(f"{row['algorithm']:<16}{row['mode']:<22}{row['size']:>5}{row['arrays_per_second']:>14,.0f}")
+
+def print_network_benchmark(args):
+    rows = run_network_benchmark(args.sizes, args.sequential)
+    print(f"{'Algorithm':<21}{'n':>9}{'NumPy elem/s':>15}{'Python elem/s':>15}")
+    for row in rows:
+        vectorized = "-" if row["vectorized"] is None else f"{row['vectorized']:,.0f}"
+        print(f"{row['algorithm']:<21}{row['size']:>9}{vectorized:>15}{row['python']:>15,.0f}")
+
+def print_partial_benchmark(args):
+    runtimes_dict, full_sort_dict = run_partial_benchmark(args.size, args.fractions, args.algorithms, args.full_sorts)
+    print(f"n = {args.size}; " + ", ".join(f"{name} {runtime:.2f} ms" for name, runtime in full_sort_dict.items()))
+    fastest_full = min(full_sort_dict.values())
+    print(f"{'Operation':<14}{'k/n':>8}{'k':>9}{'ms':>10}{'vs full':>9}")
+    for algo_name, runtimes in runtimes_dict.items():
+        for fraction, runtime in zip(args.fractions, runtimes):
+            print(f"{algo_name:<14}{fraction:>8g}{int(fraction * args.size):>9}{runtime:>10.2f}{runtime / fastest_full:>8.2f}x")
+
+def print_profile(args):
+    from sortProfiler import format_profile, profile_algorithm
+
+    report = profile_algorithm(args.algorithm, args.size, args.distribution, k_fraction=args.k_fraction)
+    print(format_profile(report, args.top))
+
+def parse_shard(text):
+    try:
+        shard_index, shard_count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected INDEX/COUNT, e.g. 0/4")
+    return shard_index, shard_count
+
+def write_spec(args):
+    spec = make_job_spec(
+        args.algorithms, parse_sizes(args.max_size, args.step_size), args.distributions,
+        args.trials, args.time_budget, args.seed, args.k_fraction
+    )
+    save_json(spec, args.output)
+    print(f"Wrote {args.output}: {len(spec_units(spec))} work units, spec {spec_id(spec)}")
+
+def run_spec_shard(args):
+    shard_index, shard_count = args.shard
+    save_json(run_shard(load_json(args.spec), shard_index, shard_count), args.output)
+    print(f"Wrote shard {shard_index}/{shard_count} to {args.output}")
+
+def merge_shard_files(args):
+    save_json(merge_shards([load_json(path) for path in args.shards]), args.output)
+    print(f"Merged {len(args.shards)} shards into {args.output}")
+
+def run_spec_locally(args):
+    save_json(run_sharded_locally(load_json(args.spec), args.shards, args.processes), args.output)
+    print(f"Ran {args.shards} shards locally into {args.output}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sortify benchmarks without the GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    keys_parser = subparsers.add_parser("keys", help="compare key= against per-comparison key calls")
+    keys_parser.add_argument("--algorithms", nargs="+", default=ALGORITHM_NAMES, metavar="NAME")
+    keys_parser.add_argument("--max-size", type=int, default=1000)
+    keys_parser.add_argument("--step-size", type=int, default=250)
+    keys_parser.set_defaults(handler=print_key_benchmark)
+
+    auto_parser = subparsers.add_parser("auto", help="compare Auto Sort against each fixed algorithm")
+    auto_parser.add_argument("--algorithms", nargs="+", default=[name for name in ALGORITHM_NAMES if name != "Auto Sort"], metavar="NAME")
+    auto_parser.add_argument("--size", type=int, default=2000)
+    auto_parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=list(DISTRIBUTIONS))
+    auto_parser.set_defaults(handler=print_auto_benchmark)
+
+    events_parser = subparsers.add_parser("events", help="events per second of recursive vs iterative visual sorts")
+    events_parser.add_argument("--algorithms", nargs="+", default=list(GENERATOR_VERSIONS), choices=list(GENERATOR_VERSIONS))
+    events_parser.add_argument("--sizes", nargs="+", type=int, default=[500, 2000])
+    events_parser.add_argument("--distributions", nargs="+", default=["random"], choices=list(DISTRIBUTIONS))
+    events_parser.set_defaults(handler=print_events_benchmark)
+
+    backends_parser = subparsers.add_parser("backends", help="compare list and typed buffer storage")
+    backends_parser.add_argument("--algorithms", nargs="+", default=["Merge Sort", "Quick Sort", "Heap Sort", "Shell Sort"], metavar="NAME")
+    backends_parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000])
+    backends_parser.add_argument("--backends", nargs="+", default=list(STORAGE_BACKENDS), choices=list(STORAGE_BACKENDS))
+    backends_parser.set_defaults(handler=print_backend_benchmark)
+
+    partial_parser = subparsers.add_parser("partial", help="cost of partial sort, top-k and nth element as k/n varies")
+    partial_parser.add_argument("--size", type=int, default=100000)
+    partial_parser.add_argument("--fractions", nargs="+", type=float, default=K_FRACTIONS, metavar="K/N")
+    partial_parser.add_argument("--algorithms", nargs="+", default=PARTIAL_ALGORITHM_NAMES, choices=PARTIAL_ALGORITHM_NAMES)
+    partial_parser.add_argument("--full-sorts", nargs="+", default=["Quick Sort", "Merge Sort"], metavar="NAME")
+    partial_parser.set_defaults(handler=print_partial_benchmark)
+
+    profile_parser = subparsers.add_parser("profile", help="per-line hit counts and time of one algorithm at one size")
+    profile_parser.add_argument("algorithm", choices=ALGORITHM_NAMES + PARTIAL_ALGORITHM_NAMES)
+    profile_parser.add_argument("--size", type=int, default=2000)
+    profile_parser.add_argument("--distribution", default="random", choices=list(DISTRIBUTIONS))
+    profile_parser.add_argument("--k-fraction", type=float, default=None, metavar="K/N")
+    profile_parser.add_argument("--top", type=int, default=20, help="number of lines to show")
+    profile_parser.set_defaults(handler=print_profile)
+
+    batch_parser = subparsers.add_parser("batch", help="arrays per second when sorting many small arrays")
+    batch_parser.add_argument("--sizes", nargs="+", type=int, default=BATCH_SIZES)
+    batch_parser.add_argument("--count", type=int, default=10000, help="arrays per batch")
+    batch_parser.add_argument("--algorithms", nargs="+", default=["Insertion Sort", "Quick Sort", "Merge Sort"], metavar="NAME")
+    batch_parser.add_argument("--processes", type=int, default=None)
+    batch_parser.set_defaults(handler=print_batch_benchmark)
+
+    networks_parser = subparsers.add_parser("networks", help="throughput of vectorized sorting networks vs sequential sorts")
+    networks_parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    networks_parser.add_argument("--sequential", nargs="+", default=["Quick Sort", "Merge Sort"], metavar="NAME")
+    networks_parser.set_defaults(handler=print_network_benchmark)
+
+    spec_parser = subparsers.add_parser("spec", help="write a job spec for a sharded sweep")
+    spec_parser.add_argument("--algorithms", nargs="+", default=ALGORITHM_NAMES, metavar="NAME")
+    spec_parser.add_argument("--max-size", type=int, default=1000)
+    spec_parser.add_argument("--step-size", type=int, default=100)
+    spec_parser.add_argument("--distributions", nargs="+", default=["random"], choices=list(DISTRIBUTIONS))
+    spec_parser.add_argument("--trials", type=int, default=1)
+    spec_parser.add_argument("--time-budget", type=float, default=None, metavar="MS")
+    spec_parser.add_argument("--seed", type=int, default=0)
+    spec_parser.add_argument("--k-fraction", type=float, default=None, metavar="K/N")
+    spec_parser.add_argument("-o", "--output", default="spec.json")
+    spec_parser.set_defaults(handler=write_spec)
+
+    run_parser = subparsers.add_parser("run", help="run one shard of a job spec")
+    run_parser.add_argument("spec")
+    run_parser.add_argument("--shard", type=parse_shard, default=(0, 1), metavar="INDEX/COUNT")
+    run_parser.add_argument("-o", "--output", required=True)
+    run_parser.set_defaults(handler=run_spec_shard)
+
+    merge_parser = subparsers.add_parser("merge", help="merge shard results into one dataset")
+    merge_parser.add_argument("shards", nargs="+")
+    merge_parser.add_argument("-o", "--output", default="results.json")
+    merge_parser.set_defaults(handler=merge_shard_files)
+
+    local_parser = subparsers.add_parser("local", help="run every shard of a job spec in local processes")
+    local_parser.add_argument("spec")
+    local_parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    local_parser.add_argument("--processes", type=int, default=None)
+    local_parser.add_argument("-o", "--output", default="results.json")
+    local_parser.set_defaults(handler=run_spec_locally)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+if __name__ == '__main__':
+    main()
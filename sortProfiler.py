@@ -0,0 +1,218 @@
+import linecache
+import random
+import sys
+import time
+import types
+
+import sortAlgorithms
+from sortBenchmark import benchmark_function, make_input, time_sort
+
+# Line-level profiling of the sorting functions
+#
+# Re-runs one algorithm at one size with a deterministic line profiler attached to
+# the code in sortAlgorithms.py only. Each line gets its hit count and the time from
+# the moment it started until the next traced event, which includes any builtins it
+# called. The same input is also timed without the profiler, so the cost the
+# profiler adds per line event can be estimated and taken back out.
+#
+# On Python 3.12+ lines are counted with sys.monitoring LINE events enabled on just
+# the sortAlgorithms code objects; older versions fall back to sys.settrace.
+
+PROFILER_NAME = "sortify"
+
+# Every code object defined in module, including nested functions, lambdas and the
+# functions behind the key= wrappers
+def module_code_objects(module):
+    codes = set()
+    pending = []
+    for value in vars(module).values():
+        members = vars(value).values() if isinstance(value, type) else [value]
+        for member in members:
+            while isinstance(member, types.FunctionType):
+                pending.append(member.__code__)
+                member = getattr(member, "__wrapped__", None)
+    while pending:
+        code = pending.pop()
+        if code in codes or code.co_filename != module.__file__:
+            continue
+        codes.add(code)
+        pending.extend(const for const in code.co_consts if isinstance(const, types.CodeType))
+    return codes
+
+# Per-line hit counts and times. Each traced frame keeps the line it is on in a stack,
+# so time spent in a call is charged to the callee's lines and the caller resumes
+# its own line when the call returns.
+class LineTimer:
+    def __init__(self):
+        self.hits = {}
+        self.times = {}
+        self.stack = []
+        self.last = 0
+        self.tracer = None
+
+    def charge(self):
+        now = time.perf_counter_ns()
+        if self.stack and self.stack[-1] is not None:
+            key = self.stack[-1]
+            self.times[key] = self.times.get(key, 0) + now - self.last
+        self.last = now
+
+    # enter and leave ignore their arguments so they can be used as callbacks for
+    # any start, resume, return or yield event directly
+    def enter(self, *args):
+        self.charge()
+        self.stack.append(None)
+
+    def leave(self, *args):
+        self.charge()
+        if self.stack:
+            self.stack.pop()
+
+    # The hot path, so charge() is inlined
+    def line(self, code, line_number):
+        now = time.perf_counter_ns()
+        stack = self.stack
+        key = (code, line_number)
+        if stack:
+            previous = stack[-1]
+            if previous is not None:
+                self.times[previous] = self.times.get(previous, 0) + now - self.last
+            stack[-1] = key
+        else:
+            stack.append(key)
+        self.hits[key] = self.hits.get(key, 0) + 1
+        self.last = now
+
+# Returns False without running function if the profiler tool id is already taken,
+# for example by cProfile or a debugger
+def _run_with_monitoring(timer, codes, function):
+    monitoring = sys.monitoring
+    events = monitoring.events
+    tool_id = monitoring.PROFILER_ID
+    try:
+        monitoring.use_tool_id(tool_id, PROFILER_NAME)
+    except ValueError:
+        return False
+    callbacks = {
+        events.PY_START: timer.enter,
+        events.PY_RESUME: timer.enter,
+        events.LINE: timer.line,
+        events.PY_RETURN: timer.leave,
+        events.PY_YIELD: timer.leave,
+        # Unwinding can only be enabled globally, so other code is filtered out here
+        events.PY_UNWIND: lambda code, offset, exception: timer.leave() if code in codes else None,
+    }
+    local_events = events.PY_START | events.PY_RESUME | events.LINE | events.PY_RETURN | events.PY_YIELD
+    try:
+        for event, callback in callbacks.items():
+            monitoring.register_callback(tool_id, event, callback)
+        for code in codes:
+            monitoring.set_local_events(tool_id, code, local_events)
+        monitoring.set_events(tool_id, events.PY_UNWIND)
+        function()
+    finally:
+        monitoring.set_events(tool_id, 0)
+        for code in codes:
+            monitoring.set_local_events(tool_id, code, 0)
+        for event in callbacks:
+            monitoring.register_callback(tool_id, event, None)
+        monitoring.free_tool_id(tool_id)
+    return True
+
+def _run_with_settrace(timer, codes, function):
+    def trace_lines(frame, event, arg):
+        if event == "line":
+            timer.line(frame.f_code, frame.f_lineno)
+        elif event == "return":
+            timer.leave()
+        return trace_lines
+
+    # Called for every new or resumed frame; only sortAlgorithms frames are traced
+    def trace_calls(frame, event, arg):
+        if event != "call" or frame.f_code not in codes:
+            return None
+        timer.enter()
+        return trace_lines
+
+    previous = sys.gettrace()
+    sys.settrace(trace_calls)
+    try:
+        function()
+    finally:
+        sys.settrace(previous)
+
+# Name of the line tracer preferred on this interpreter
+def tracer_name():
+    return "sys.monitoring" if hasattr(sys, "monitoring") else "sys.settrace"
+
+# Run function() under the line profiler, returning (LineTimer, runtime in ms). The
+# tracer actually used is left in timer.tracer.
+def run_profiled(function, module=sortAlgorithms):
+    codes = module_code_objects(module)
+    timer = LineTimer()
+    timer.tracer = tracer_name()
+    start_time = time.perf_counter()
+    if timer.tracer != "sys.monitoring" or not _run_with_monitoring(timer, codes, function):
+        timer.tracer = "sys.settrace"
+        _run_with_settrace(timer, codes, function)
+    return timer, (time.perf_counter() - start_time) * 1000
+
+# Profile the fast version of an algorithm on one seeded input. Returns a dict with
+# the unprofiled and profiled runtimes, the estimated profiler overhead per line
+# event, and one row per executed line sorted by time, where adjusted_ms is the time
+# with that overhead taken out.
+def profile_algorithm(algo_name, size, distribution="random", seed=0, k_fraction=None, repeats=3):
+    data = make_input(distribution, size, random.Random(f"{seed}:{distribution}:{size}"))
+    sorting_function = benchmark_function(algo_name, k_fraction)
+    runtime_ms = min(time_sort(sorting_function, list(data)) for _ in range(repeats))
+
+    arr = list(data)
+    timer, profiled_ms = run_profiled(lambda: sorting_function(arr))
+    events = sum(timer.hits.values())
+    overhead_ms = max(profiled_ms - runtime_ms, 0.0)
+    overhead_ns = overhead_ms * 1e6 / events if events else 0.0
+
+    lines = []
+    for (code, line_number), hits in timer.hits.items():
+        time_ms = timer.times.get((code, line_number), 0) / 1e6
+        lines.append({
+            # co_qualname is new in Python 3.11
+            "function": getattr(code, "co_qualname", code.co_name),
+            "line": line_number,
+            "hits": hits,
+            "time_ms": time_ms,
+            "adjusted_ms": max(time_ms - hits * overhead_ns / 1e6, 0.0),
+            "source": linecache.getline(code.co_filename, line_number).strip(),
+        })
+    lines.sort(key=lambda row: row["time_ms"], reverse=True)
+
+    return {
+        "algorithm": algo_name,
+        "size": size,
+        "distribution": distribution,
+        "tracer": timer.tracer,
+        "runtime_ms": runtime_ms,
+        "profiled_ms": profiled_ms,
+        "events": events,
+        "overhead_ns_per_event": overhead_ns,
+        "lines": lines,
+    }
+
+# Plain text report of the hottest lines, for the benchmark window and the CLI
+def format_profile(report, top=20):
+    slowdown = report["profiled_ms"] / report["runtime_ms"] if report["runtime_ms"] > 0 else float("inf")
+    traced_ms = sum(row["time_ms"] for row in report["lines"]) or 1.0
+    output = [
+        f"{report['algorithm']}, n={report['size']} ({report['distribution']}), traced with {report['tracer']}",
+        f"Unprofiled {report['runtime_ms']:.2f} ms, profiled {report['profiled_ms']:.2f} ms ({slowdown:.1f}x)",
+        f"{report['events']:,} line events, about {report['overhead_ns_per_event']:.0f} ns of profiler overhead each; "
+        "adj. ms is the line's time with that overhead removed",
+        "",
+        f"{'hits':>10}{'ms':>10}{'adj. ms':>10}{'%':>7}  {'line':>5}  function: source",
+    ]
+    for row in report["lines"][:top]:
+        output.append(
+            f"{row['hits']:>10,}{row['time_ms']:>10.2f}{row['adjusted_ms']:>10.2f}"
+            f"{100 * row['time_ms'] / traced_ms:>7.1f}  {row['line']:>5}  {row['function']}: {row['source']}"
+        )
+    return "\n".join(output)
@@ -0,0 +1,498 @@
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sortAlgorithms import ALGORITHM_NAMES, PARTIAL_ALGORITHM_NAMES
+from sortBenchmark import DISTRIBUTIONS, make_job_spec, merge_shards, parse_sizes, run_shard
+
+# Local benchmark job service
+#
+# Clients submit sweep jobs over HTTP/JSON. Jobs are kept in a SQLite queue, so they
+# survive restarts, and a pool of worker processes runs them one at a time each with
+# the same engine as 'sortBenchmark.py run'. Progress is reported per (unit, size)
+# cell, and a running job can be cancelled, which takes effect after the cell in
+# progress. Finished results are served as the same merged dataset JSON that
+# 'Open Results...' reads, or as CSV.
+#
+#   GET  /algorithms                 algorithm and distribution names
+#   GET  /jobs                       all jobs, newest first
+#   POST /jobs                       submit a job, see job_spec_from_request
+#   GET  /jobs/<id>                  status and progress of one job
+#   POST /jobs/<id>/cancel           cancel a queued or running job
+#   GET  /jobs/<id>/results          dataset JSON, or CSV with ?format=csv
+
+DEFAULT_PORT = 8765
+
+# Seconds an idle worker waits before looking for a new job
+POLL_INTERVAL = 0.2
+
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    spec TEXT NOT NULL,
+    status TEXT NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    cells_done INTEGER NOT NULL DEFAULT 0,
+    cells_total INTEGER NOT NULL,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    worker TEXT,
+    error TEXT,
+    result TEXT
+)
+"""
+
+class JobCancelled(Exception):
+    pass
+
+# Raised in a worker when the service stops, to put its job back in the queue
+class ServiceStopping(Exception):
+    pass
+
+# Raised by ServiceClient with the error message the service sent back
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+# Build a job spec from a submitted JSON body. Sizes are given either as a list or
+# as max_size and step_size like the benchmark settings. Raises ValueError if the
+# request does not describe a valid sweep.
+def job_spec_from_request(body):
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object")
+    algorithms = body.get("algorithms")
+    if not algorithms or not isinstance(algorithms, list):
+        raise ValueError("algorithms must be a non-empty list")
+    if "sizes" in body:
+        sizes = body["sizes"]
+    elif "max_size" in body:
+        sizes = parse_sizes(int(body["max_size"]), int(body.get("step_size", 100)))
+    else:
+        raise ValueError("Give either sizes or max_size")
+    if not sizes or not all(isinstance(size, int) and size >= 0 for size in sizes):
+        raise ValueError("sizes must be a non-empty list of non-negative integers")
+    trials = body.get("trials", 1)
+    if not isinstance(trials, int) or trials < 1:
+        raise ValueError("trials must be a positive integer")
+    time_budget_ms = body.get("time_budget_ms")
+    if time_budget_ms is not None:
+        time_budget_ms = float(time_budget_ms)
+    k_fraction = body.get("k_fraction")
+    if k_fraction is not None:
+        k_fraction = float(k_fraction)
+        if not 0 <= k_fraction <= 1:
+            raise ValueError("k_fraction must be between 0 and 1")
+    return make_job_spec(
+        algorithms, sizes, body.get("distributions", ["random"]), trials, time_budget_ms, int(body.get("seed", 0)),
+        k_fraction
+    )
+
+# CSV of a dataset, one row per measured cell. truncated is 1 on the last size a
+# series ran before the time budget cut it off.
+def dataset_csv(dataset):
+    cutoffs = {(row["algorithm"], row["distribution"], row["trial"], row["size"]) for row in dataset["truncated"]}
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["algorithm", "distribution", "trial", "size", "runtime_ms", "truncated"])
+    for row in dataset["results"]:
+        cell = (row["algorithm"], row["distribution"], row["trial"], row["size"])
+        writer.writerow([*cell, row["runtime_ms"], int(cell in cutoffs)])
+    return output.getvalue()
+
+# The persistent job queue. Each process and request thread opens its own
+# connection; claiming a job is one IMMEDIATE transaction, so two workers never
+# take the same job.
+class JobQueue:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def submit(self, spec, cells_total):
+        cursor = self.connection.execute(
+            "INSERT INTO jobs (spec, status, cells_total, submitted) VALUES (?, 'queued', ?, ?)",
+            (json.dumps(spec), cells_total, time.time()),
+        )
+        return cursor.lastrowid
+
+    # The job as a JSON-ready dict without its result, or None if there is no such job
+    def job(self, job_id):
+        row = self.connection.execute(
+            "SELECT id, spec, status, cancel_requested, cells_done, cells_total, submitted, started, finished, "
+            "worker, error FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return None if row is None else self.job_dict(row)
+
+    def jobs(self):
+        rows = self.connection.execute(
+            "SELECT id, spec, status, cancel_requested, cells_done, cells_total, submitted, started, finished, "
+            "worker, error FROM jobs ORDER BY id DESC"
+        ).fetchall()
+        return [self.job_dict(row) for row in rows]
+
+    @staticmethod
+    def job_dict(row):
+        job = dict(row)
+        job["spec"] = json.loads(job["spec"])
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        job["progress"] = job["cells_done"] / job["cells_total"] if job["cells_total"] else 1.0
+        return job
+
+    def result(self, job_id):
+        row = self.connection.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None or row["result"] is None else json.loads(row["result"])
+
+    # Take the oldest queued job for worker, returning (id, spec) or None
+    def claim(self, worker):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.connection.execute(
+                "SELECT id, spec FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                self.connection.execute(
+                    "UPDATE jobs SET status = 'running', started = ?, worker = ? WHERE id = ?",
+                    (time.time(), worker, row["id"]),
+                )
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        return None if row is None else (row["id"], json.loads(row["spec"]))
+
+    # Record progress and return whether the job has been asked to stop
+    def set_progress(self, job_id, cells_done):
+        self.connection.execute("UPDATE jobs SET cells_done = ? WHERE id = ?", (cells_done, job_id))
+        row = self.connection.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row["cancel_requested"])
+
+    def finish(self, job_id, status, result=None, error=None):
+        self.connection.execute(
+            "UPDATE jobs SET status = ?, finished = ?, result = ?, error = ? WHERE id = ?",
+            (status, time.time(), None if result is None else json.dumps(result), error, job_id),
+        )
+
+    # Queued jobs are cancelled at once; running ones are flagged and stopped by
+    # their worker. Returns the job, or None if there is no such job.
+    def cancel(self, job_id):
+        self.connection.execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ?, cancel_requested = 1 WHERE id = ? AND status = 'queued'",
+            (time.time(), job_id),
+        )
+        self.connection.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        return self.job(job_id)
+
+    # Put a running job back in the queue to be started again from scratch, unless it
+    # was cancelled meanwhile
+    def requeue(self, job_id):
+        self.connection.execute(
+            "UPDATE jobs SET status = 'queued', cells_done = 0, started = NULL, worker = NULL "
+            "WHERE id = ? AND status = 'running' AND cancel_requested = 0", (job_id,)
+        )
+        self.connection.execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? WHERE id = ? AND status = 'running'",
+            (time.time(), job_id),
+        )
+
+    # Jobs left running by a service that stopped are started again from scratch
+    def requeue_running(self):
+        self.connection.execute(
+            "UPDATE jobs SET status = 'queued', cells_done = 0, started = NULL, worker = NULL "
+            "WHERE status = 'running' AND cancel_requested = 0"
+        )
+        self.connection.execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? WHERE status = 'running'", (time.time(),)
+        )
+
+# Run one claimed job. Cancellation and stop_event are checked after every cell.
+def run_job(queue, job_id, spec, stop_event=None):
+    def progress(cells_done, cells_total):
+        if queue.set_progress(job_id, cells_done):
+            raise JobCancelled()
+        if stop_event is not None and stop_event.is_set():
+            raise ServiceStopping()
+
+    try:
+        dataset = merge_shards([run_shard(spec, progress=progress)])
+    except JobCancelled:
+        queue.finish(job_id, "cancelled")
+    except ServiceStopping:
+        queue.requeue(job_id)
+    except Exception as error:
+        queue.finish(job_id, "failed", error=f"{type(error).__name__}: {error}")
+    else:
+        queue.finish(job_id, "done", result=dataset)
+
+# Worker process: run queued jobs until stop_event is set
+def worker_main(db_path, stop_event, name, poll_interval=POLL_INTERVAL):
+    queue = JobQueue(db_path)
+    try:
+        while not stop_event.is_set():
+            job = queue.claim(name)
+            if job is None:
+                stop_event.wait(poll_interval)
+            else:
+                run_job(queue, *job, stop_event)
+    finally:
+        queue.close()
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SortifyService/1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, content_type):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload), "application/json")
+
+    def send_error_json(self, status, message):
+        self.send_json(status, {"error": message})
+
+    def route(self):
+        url = urllib.parse.urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        job_id = None
+        if len(parts) >= 2 and parts[0] == "jobs":
+            if not parts[1].isdigit():
+                return parts, None, url
+            job_id = int(parts[1])
+        return parts, job_id, url
+
+    def do_GET(self):
+        parts, job_id, url = self.route()
+        queue = JobQueue(self.server.db_path)
+        try:
+            if parts == ["algorithms"]:
+                self.send_json(HTTPStatus.OK, {
+                    "algorithms": ALGORITHM_NAMES + PARTIAL_ALGORITHM_NAMES,
+                    "distributions": list(DISTRIBUTIONS),
+                })
+            elif parts == ["jobs"]:
+                self.send_json(HTTPStatus.OK, {"jobs": queue.jobs()})
+            elif job_id is not None and len(parts) == 2:
+                job = queue.job(job_id)
+                if job is None:
+                    self.send_error_json(HTTPStatus.NOT_FOUND, f"No job {job_id}")
+                else:
+                    self.send_json(HTTPStatus.OK, job)
+            elif job_id is not None and parts[2:] == ["results"]:
+                self.send_results(queue, job_id, urllib.parse.parse_qs(url.query).get("format", ["json"])[0])
+            else:
+                self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {url.path}")
+        finally:
+            queue.close()
+
+    def send_results(self, queue, job_id, result_format):
+        job = queue.job(job_id)
+        if job is None:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No job {job_id}")
+        elif job["status"] != "done":
+            self.send_error_json(HTTPStatus.CONFLICT, f"Job {job_id} is {job['status']}")
+        elif result_format == "csv":
+            self.send_body(HTTPStatus.OK, dataset_csv(queue.result(job_id)), "text/csv")
+        elif result_format == "json":
+            self.send_json(HTTPStatus.OK, queue.result(job_id))
+        else:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, f"Unknown format {result_format}")
+
+    def do_POST(self):
+        parts, job_id, url = self.route()
+        queue = JobQueue(self.server.db_path)
+        try:
+            if parts == ["jobs"]:
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    spec = job_spec_from_request(json.loads(self.rfile.read(length) or b"null"))
+                except (ValueError, TypeError) as error:
+                    self.send_error_json(HTTPStatus.BAD_REQUEST, str(error))
+                    return
+                cells_total = len(spec["algorithms"]) * len(spec["distributions"]) * spec["trials"] * len(spec["sizes"])
+                self.send_json(HTTPStatus.CREATED, queue.job(queue.submit(spec, cells_total)))
+            elif job_id is not None and parts[2:] == ["cancel"]:
+                job = queue.cancel(job_id)
+                if job is None:
+                    self.send_error_json(HTTPStatus.NOT_FOUND, f"No job {job_id}")
+                else:
+                    self.send_json(HTTPStatus.OK, job)
+            else:
+                self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {url.path}")
+        finally:
+            queue.close()
+
+# The HTTP server and worker pool. Port 0 picks a free port; the address actually
+# used is in url once started.
+class SortService:
+    def __init__(self, db_path, workers=2, host="127.0.0.1", port=DEFAULT_PORT, verbose=False,
+                 poll_interval=POLL_INTERVAL):
+        self.db_path = os.path.abspath(db_path)
+        self.worker_count = workers
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        self.poll_interval = poll_interval
+        self.server = None
+        self.server_thread = None
+        self.workers = []
+        self.stop_event = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        queue = JobQueue(self.db_path)
+        queue.requeue_running()
+        queue.close()
+
+        self.server = ThreadingHTTPServer((self.host, self.port), ServiceRequestHandler)
+        self.server.db_path = self.db_path
+        self.server.verbose = self.verbose
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+        # Spawned rather than forked, since the server thread is already running
+        context = multiprocessing.get_context("spawn")
+        self.stop_event = context.Event()
+        self.workers = []
+        for index in range(self.worker_count):
+            worker_args = (self.db_path, self.stop_event, f"worker-{index}", self.poll_interval)
+            self.workers.append(context.Process(target=worker_main, args=worker_args, daemon=True))
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    # Stop taking requests and jobs. Workers stop after the cell they are on and put
+    # their job back in the queue. A worker still busy after timeout, on one very
+    # long cell, is terminated, and its job is queued again on the next start.
+    def stop(self, timeout=10):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.stop_event is not None:
+            self.stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self.workers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+# Client for the service, used by the GUI and tests
+class ServiceClient:
+    def __init__(self, url=f"http://127.0.0.1:{DEFAULT_PORT}", timeout=10):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, payload=None, parse_json=True):
+        data = None if payload is None else json.dumps(payload).encode()
+        request = urllib.request.Request(self.url + path, data=data, method=method)
+        if data is not None:
+            request.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read().decode()
+        except urllib.error.HTTPError as error:
+            try:
+                message = json.loads(error.read().decode())["error"]
+            except (ValueError, KeyError):
+                message = error.reason
+            raise ServiceError(error.code, message) from None
+        return json.loads(body) if parse_json else body
+
+    def submit(self, algorithms, sizes, distributions=("random",), trials=1, time_budget_ms=None, seed=0,
+               k_fraction=None):
+        return self.request("POST", "/jobs", {
+            "algorithms": list(algorithms),
+            "sizes": list(sizes),
+            "distributions": list(distributions),
+            "trials": trials,
+            "time_budget_ms": time_budget_ms,
+            "seed": seed,
+            "k_fraction": k_fraction,
+        })
+
+    def job(self, job_id):
+        return self.request("GET", f"/jobs/{job_id}")
+
+    def jobs(self):
+        return self.request("GET", "/jobs")["jobs"]
+
+    def cancel(self, job_id):
+        return self.request("POST", f"/jobs/{job_id}/cancel")
+
+    def results(self, job_id):
+        return self.request("GET", f"/jobs/{job_id}/results")
+
+    def results_csv(self, job_id):
+        return self.request("GET", f"/jobs/{job_id}/results?format=csv", parse_json=False)
+
+    # Poll until the job is done, failed or cancelled, and return it
+    def wait(self, job_id, timeout=60, poll_interval=POLL_INTERVAL):
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.job(job_id)
+            if job["status"] in ("done", "failed", "cancelled"):
+                return job
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} is still {job['status']}")
+            time.sleep(poll_interval)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sortify benchmark job service.")
+    parser.add_argument("--db", default="sortify-jobs.sqlite", help="SQLite file holding the job queue")
+    parser.add_argument("--workers", type=int, default=2, help="worker processes running jobs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    service = SortService(args.db, args.workers, args.host, args.port, args.verbose).start()
+    print(f"Sortify service on {service.url} with {args.workers} workers, queue in {service.db_path}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+
+if __name__ == '__main__':
+    main()
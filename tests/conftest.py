@@ -0,0 +1,91 @@
+import json
+import os
+import platform
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sortBenchmark import calibration_runtime
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Micro-benchmark results collected during the session, reported at the end
+benchmark_results = []
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sortify benchmarks")
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=float(os.environ.get("SORTIFY_BENCH_THRESHOLD", "1.5")),
+        help="fail a benchmark that is this many times slower than its baseline "
+             "(default 1.5, or $SORTIFY_BENCH_THRESHOLD)",
+    )
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help=f"rewrite {os.path.basename(BASELINE_PATH)} from this run instead of comparing",
+    )
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: fixed-seed performance regression benchmark")
+
+@pytest.fixture(scope="session")
+def benchmark_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {"results": {}}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+@pytest.fixture(scope="session")
+def calibration_ms():
+    return calibration_runtime()
+
+@pytest.fixture(scope="session")
+def benchmark_log():
+    return benchmark_results
+
+def pytest_sessionfinish(session, exitstatus):
+    if not session.config.getoption("--update-baseline") or not benchmark_results:
+        return
+
+    baseline = {"results": {}}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    baseline["python"] = platform.python_version()
+    for result in benchmark_results:
+        baseline["results"][result["algorithm"]] = {"size": result["size"], "score": round(result["score"], 4)}
+    with open(BASELINE_PATH, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not benchmark_results:
+        return
+
+    threshold = config.getoption("--bench-threshold")
+    terminalreporter.section("sortify benchmarks")
+    terminalreporter.write_line(
+        "score = runtime / calibration workload, ratio = score / baseline score "
+        f"(threshold {threshold:.2f}x)"
+    )
+    terminalreporter.write_line(
+        f"{'Algorithm':<21}{'n':>6}{'ms':>10}{'score':>9}{'baseline':>10}{'ratio':>8}  status"
+    )
+    for result in benchmark_results:
+        baseline = result["baseline"]
+        if config.getoption("--update-baseline"):
+            status = "updated"
+        elif baseline is None:
+            status = "no baseline"
+        else:
+            status = "REGRESSED" if result["ratio"] > threshold else "ok"
+        baseline_text = "-" if baseline is None else f"{baseline:.3f}"
+        ratio_text = "-" if result["ratio"] is None else f"{result['ratio']:.2f}x"
+        terminalreporter.write_line(
+            f"{result['algorithm']:<21}{result['size']:>6}{result['runtime']:>10.2f}"
+            f"{result['score']:>9.3f}{baseline_text:>10}{ratio_text:>8}  {status}"
+        )
@@ -0,0 +1,39 @@
+import pytest
+
+from sortAlgorithms import ALGORITHM_NAMES
+from sortBenchmark import micro_benchmark_size, run_micro_benchmark
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+def test_no_performance_regression(algo_name, request, benchmark_baseline, calibration_ms, benchmark_log):
+    threshold = request.config.getoption("--bench-threshold")
+    size = micro_benchmark_size(algo_name)
+    runtime = run_micro_benchmark(algo_name, size)
+
+    baseline = benchmark_baseline["results"].get(algo_name)
+    if baseline is not None and baseline["size"] != size:
+        baseline = None
+
+    # Re-measure before reporting a regression so one noisy run does not fail the suite
+    if baseline is not None and runtime / calibration_ms / baseline["score"] > threshold:
+        runtime = min(runtime, run_micro_benchmark(algo_name, size, repeats=15))
+
+    score = runtime / calibration_ms
+    ratio = None if baseline is None else score / baseline["score"]
+    benchmark_log.append({
+        "algorithm": algo_name,
+        "size": size,
+        "runtime": runtime,
+        "score": score,
+        "baseline": None if baseline is None else baseline["score"],
+        "ratio": ratio,
+    })
+
+    if request.config.getoption("--update-baseline"):
+        return
+    if baseline is None:
+        pytest.skip(f"no baseline for {algo_name} at n={size}; run pytest --update-baseline")
+    assert ratio <= threshold, (
+        f"{algo_name} (n={size}) took {runtime:.2f} ms, {ratio:.2f}x its baseline "
+        f"score, above the {threshold:.2f}x threshold"
+    )
@@ -0,0 +1,430 @@
+import random
+import sys
+from array import array
+
+import pytest
+
+import sortAlgorithms
+from sortAlgorithms import (
+    ALGORITHM_NAMES, PARTIAL_ALGORITHM_NAMES, InversionCounter, bitonic_stages, choose_algorithm, count_inversions,
+    get_algorithm_by_name, heap_sort, heap_sort_recursive, measure_presortedness, merge_sort,
+    merge_sort_recursive, odd_even_merge_stages, quick_sort, quick_sort_recursive, sort_batch,
+    sort_range, step_indices
+)
+
+# Algorithms that keep equal elements in their original order without key=
+STABLE_ALGORITHMS = ["Bubble Sort", "Insertion Sort", "Merge Sort", "Cocktail Sort"]
+
+# Compares on key only, so stability can be checked through the tag
+class Record:
+    def __init__(self, key, tag):
+        self.key = key
+        self.tag = tag
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+    def __ge__(self, other):
+        return self.key >= other.key
+
+    def __repr__(self):
+        return f"Record({self.key!r}, {self.tag!r})"
+
+def fuzzed_inputs(seed=1234, cases=25):
+    rng = random.Random(seed)
+    yield []
+    yield [7]
+    yield list(range(50))
+    yield list(range(50, 0, -1))
+    yield [3] * 20
+    for _ in range(cases):
+        size = rng.randint(0, 120)
+        high = rng.choice([1, 5, size or 1, 10 ** 6])
+        yield [rng.randint(-high, high) for _ in range(size)]
+
+def run_visual(algo_name, arr, **kwargs):
+    for _ in get_algorithm_by_name(algo_name)(arr, **kwargs):
+        pass
+    return arr
+
+def run_fast(algo_name, arr, **kwargs):
+    return get_algorithm_by_name(algo_name, False)(arr, **kwargs)
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+def test_visual_sorts_in_place(algo_name):
+    for data in fuzzed_inputs():
+        assert run_visual(algo_name, list(data)) == sorted(data)
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+def test_fast_returns_sorted(algo_name):
+    for data in fuzzed_inputs():
+        assert run_fast(algo_name, list(data)) == sorted(data)
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+def test_fast_sorts_in_place(algo_name):
+    for data in fuzzed_inputs():
+        arr = list(data)
+        assert run_fast(algo_name, arr) is arr
+        assert arr == sorted(data)
+
+@pytest.mark.parametrize("algo_name", STABLE_ALGORITHMS)
+@pytest.mark.parametrize("runner", [run_visual, run_fast])
+def test_stable_without_key(algo_name, runner):
+    rng = random.Random(99)
+    for _ in range(10):
+        records = [Record(rng.randint(0, 5), tag) for tag in range(rng.randint(0, 80))]
+        result = runner(algo_name, list(records))
+        assert [(r.key, r.tag) for r in result] == [(r.key, r.tag) for r in sorted(records, key=lambda r: r.key)]
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+@pytest.mark.parametrize("runner", [run_visual, run_fast])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_key_and_reverse_are_stable(algo_name, runner, reverse):
+    rng = random.Random(7)
+    for _ in range(10):
+        # Dicts are not orderable, so this also checks values are never compared
+        records = [{"name": rng.choice("abcde"), "id": i} for i in range(rng.randint(0, 80))]
+        result = runner(algo_name, list(records), key=lambda r: r["name"], reverse=reverse)
+        assert result == sorted(records, key=lambda r: r["name"], reverse=reverse)
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+def test_keyed_visual_steps_match_array(algo_name):
+    # Every written index is mirrored into the caller's array before the step is yielded
+    rng = random.Random(3)
+    records = [(rng.randint(0, 30), i) for i in range(60)]
+    arr = list(records)
+    seen = set()
+    for i, j, swap, _ in get_algorithm_by_name(algo_name)(arr, key=lambda r: -r[0]):
+        assert all(0 <= index < len(arr) for index in step_indices(i, j))
+        seen.update(arr)
+    assert sorted(arr) == sorted(records)
+    assert seen <= set(records)
+    assert arr == sorted(records, key=lambda r: -r[0])
+
+BUFFER_FACTORIES = {
+    "array('i')": lambda values: array("i", values),
+    "array('q')": lambda values: array("q", values),
+    "array('d')": lambda values: array("d", [v / 4 for v in values]),
+    "bytearray": lambda values: bytearray(v % 256 for v in values),
+    "memoryview": lambda values: memoryview(array("q", values)),
+}
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+@pytest.mark.parametrize("backend", BUFFER_FACTORIES)
+def test_fast_sorts_buffers_in_place(algo_name, backend):
+    make = BUFFER_FACTORIES[backend]
+    for data in fuzzed_inputs(cases=10):
+        data = [abs(v) for v in data]
+        buffer = make(data)
+        assert run_fast(algo_name, buffer) is buffer
+        assert list(buffer) == sorted(make(data))
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+@pytest.mark.parametrize("backend", BUFFER_FACTORIES)
+def test_sort_range_on_buffers(algo_name, backend):
+    make = BUFFER_FACTORIES[backend]
+    data = random.Random(5).sample(range(1000), 200)
+    buffer = make(data)
+    sort_range(get_algorithm_by_name(algo_name, False), buffer, 40, 150, reverse=True)
+    expected = list(make(data))
+    expected[40:150] = sorted(expected[40:150], reverse=True)
+    assert list(buffer) == expected
+
+def test_presortedness_profile():
+    assert measure_presortedness(list(range(1000)))["runs"] == 1
+    assert measure_presortedness(list(range(1000)))["inversion_ratio"] == 0
+    reversed_profile = measure_presortedness(list(range(1000, 0, -1)))
+    assert reversed_profile["runs"] == 1000
+    assert reversed_profile["inversion_ratio"] == 1
+    assert measure_presortedness([1, 2] * 500)["duplicate_ratio"] > 0.9
+    assert measure_presortedness(random.Random(1).sample(range(1000), 1000))["duplicate_ratio"] == 0
+
+FEW_UNIQUE = [value % 5 for value in random.Random(3).sample(range(2000), 2000)]
+
+@pytest.mark.parametrize("data, use_yield, expected", [
+    (list(range(2000)), True, "Insertion Sort"),
+    (list(range(2000, 0, -1)), True, "Shell Sort"),
+    (list(range(2000, 0, -1)), False, "Quick Sort"),
+    (random.Random(2).sample(range(2000), 2000), True, "Quick Sort"),
+    (FEW_UNIQUE, True, "Merge Sort"),
+    (FEW_UNIQUE, False, "Quick Sort"),
+])
+def test_auto_sort_choice(data, use_yield, expected):
+    name, reason = choose_algorithm(measure_presortedness(data), use_yield)
+    assert name == expected
+    assert reason
+
+def brute_force_inversions(arr):
+    return sum(1 for i in range(len(arr)) for j in range(i + 1, len(arr)) if arr[i] > arr[j])
+
+def test_count_inversions():
+    for data in fuzzed_inputs(cases=10):
+        assert count_inversions(data) == brute_force_inversions(data)
+
+def test_inversion_counter_tracks_random_writes():
+    rng = random.Random(11)
+    for _ in range(10):
+        arr = [rng.randrange(rng.choice([3, 40, 1000])) for _ in range(rng.randint(2, 200))]
+        counter = InversionCounter(arr)
+        for _ in range(100):
+            i, j = rng.randrange(len(arr)), rng.randrange(len(arr))
+            if rng.random() < 0.5:
+                arr[i], arr[j] = arr[j], arr[i]
+                counter.update(i, arr[i])
+                counter.update(j, arr[j])
+            else:
+                # Placements copy an existing value, as merges and shifts do
+                arr[i] = arr[j]
+                counter.update(i, arr[i])
+            assert counter.inversions == brute_force_inversions(arr)
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+def test_inversion_counter_follows_visual_steps(algo_name):
+    arr = random.Random(12).sample(range(300), 300)
+    counter = InversionCounter(arr)
+    for step, (i, j, swap, _) in enumerate(get_algorithm_by_name(algo_name)(arr)):
+        if swap:
+            for index in step_indices(i, j):
+                counter.update(index, arr[index])
+        if step % 500 == 0:
+            assert counter.inversions == count_inversions(arr)
+    assert counter.inversions == 0
+    assert counter.sorted_percent() == 100.0
+
+ITERATIVE_VERSIONS = [
+    (merge_sort, merge_sort_recursive),
+    (quick_sort, quick_sort_recursive),
+    (heap_sort, heap_sort_recursive),
+]
+
+@pytest.mark.parametrize("iterative, recursive", ITERATIVE_VERSIONS)
+def test_iterative_steps_match_recursive(iterative, recursive):
+    for data in fuzzed_inputs(cases=10):
+        iterative_arr, recursive_arr = list(data), list(data)
+        assert list(iterative(iterative_arr)) == list(recursive(recursive_arr))
+        assert iterative_arr == recursive_arr == sorted(data)
+
+@pytest.mark.parametrize("iterative", [iterative for iterative, _ in ITERATIVE_VERSIONS])
+def test_iterative_ignores_recursion_limit(iterative):
+    # Sorted input drives the last-element pivot quick sort to depth n
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(150)
+    try:
+        arr = list(range(400))
+        for _ in iterative(arr):
+            pass
+    finally:
+        sys.setrecursionlimit(limit)
+    assert arr == list(range(400))
+
+NETWORKS = {
+    "Bitonic Sort": bitonic_stages,
+    "Odd-Even Merge Sort": odd_even_merge_stages,
+}
+
+@pytest.mark.parametrize("stage_function", NETWORKS.values())
+def test_network_stages_are_disjoint_and_sort_zero_one_inputs(stage_function):
+    # By the 0-1 principle a network that sorts every 0/1 input sorts everything
+    rng = random.Random(21)
+    for n in list(range(0, 40)) + [100, 257]:
+        stages = stage_function(n)
+        for lows, highs in stages:
+            assert len(set(lows + highs)) == 2 * len(lows)
+            assert all(lo < hi < n for lo, hi in zip(lows, highs))
+        for _ in range(20):
+            arr = [rng.randrange(2) for _ in range(n)]
+            expected = sorted(arr)
+            for lows, highs in stages:
+                for lo, hi in zip(lows, highs):
+                    if arr[lo] > arr[hi]:
+                        arr[lo], arr[hi] = arr[hi], arr[lo]
+            assert arr == expected
+
+@pytest.mark.parametrize("algo_name, stage_function", NETWORKS.items())
+def test_network_yields_one_step_per_stage(algo_name, stage_function):
+    arr = random.Random(5).sample(range(100), 100)
+    steps = list(get_algorithm_by_name(algo_name)(arr))
+    assert len(steps) == len(stage_function(100))
+    assert arr == list(range(100))
+    for (i, j, swap, accesses), (lows, highs) in zip(steps, stage_function(100)):
+        assert (i, j) == (list(lows), list(highs))
+        assert accesses >= 2 * len(i)
+
+@pytest.mark.parametrize("algo_name", NETWORKS)
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_network_fast_paths(algo_name, vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    network_sort = get_algorithm_by_name(algo_name, use_yield=False)
+    sort = lambda arr: network_sort(arr, vectorized=vectorized)
+    rng = random.Random(8)
+    for size in (300, 1000, 1500):
+        values = [rng.randint(-1000, 1000) for _ in range(size)]
+        ints = list(values)
+        assert sort(ints) is ints and ints == sorted(values)
+        floats = [v / 3 for v in values]
+        assert sort(list(floats)) == sorted(floats)
+        # Mixed numbers keep their types, so they skip the NumPy copy
+        mixed = [v if v % 2 else v / 2 for v in values]
+        result = sort(list(mixed))
+        assert result == sorted(mixed) and sorted(map(repr, result)) == sorted(map(repr, mixed))
+        for make in BUFFER_FACTORIES.values():
+            buffer = make(values)
+            assert list(sort(buffer)) == sorted(make(values))
+
+@pytest.mark.parametrize("algo_name", NETWORKS)
+def test_network_fast_path_keeps_values_around_nan(algo_name):
+    pytest.importorskip("numpy")
+    rng = random.Random(12)
+    values = [rng.random() for _ in range(300)]
+    # np.minimum and np.maximum would copy the NaN over every value it meets
+    values[137] = float("nan")
+    network_sort = get_algorithm_by_name(algo_name, use_yield=False)
+    for arr in (list(values), array("d", values)):
+        result = list(network_sort(arr))
+        assert sorted(map(repr, result)) == sorted(map(repr, values))
+
+def test_network_sorts_without_numpy(monkeypatch):
+    monkeypatch.setattr(sortAlgorithms, "_numpy", lambda: None)
+    values = random.Random(9).sample(range(1000), 1000)
+    for algo_name in NETWORKS:
+        assert get_algorithm_by_name(algo_name, use_yield=False)(list(values)) == sorted(values)
+
+def run_partial(algo_name, use_yield, arr, **kwargs):
+    result = get_algorithm_by_name(algo_name, use_yield)(arr, **kwargs)
+    if use_yield:
+        for _ in result:
+            pass
+        return arr
+    return result
+
+def check_partial(algo_name, result, data, k, reverse=False):
+    expected = sorted(data, reverse=reverse)
+    assert sorted(result) == sorted(data)
+    if algo_name == "Nth Element":
+        before = (lambda a, b: a >= b) if reverse else (lambda a, b: a <= b)
+        assert result[k] == expected[k]
+        assert all(before(value, result[k]) for value in result[:k])
+        assert all(before(result[k], value) for value in result[k + 1:])
+    else:
+        assert result[:k] == expected[:k]
+
+def partial_ks(data, algo_name):
+    n = len(data)
+    if algo_name == "Nth Element":
+        return sorted({0, n // 3, n - 1}) if n else []
+    return sorted({0, 1, n // 4, n})
+
+@pytest.mark.parametrize("algo_name", PARTIAL_ALGORITHM_NAMES)
+@pytest.mark.parametrize("use_yield", [True, False])
+def test_partial_operations(algo_name, use_yield):
+    for data in fuzzed_inputs(cases=15):
+        for k in partial_ks(data, algo_name):
+            result = run_partial(algo_name, use_yield, list(data), k=k)
+            check_partial(algo_name, result, data, k)
+            result = run_partial(algo_name, use_yield, list(data), k=k, reverse=True)
+            check_partial(algo_name, result, data, k, reverse=True)
+
+@pytest.mark.parametrize("algo_name", PARTIAL_ALGORITHM_NAMES)
+def test_partial_default_k(algo_name):
+    data = random.Random(4).sample(range(200), 200)
+    result = run_partial(algo_name, False, list(data))
+    if algo_name == "Nth Element":
+        assert result[100] == 100
+    else:
+        assert result[:20] == list(range(20))
+
+@pytest.mark.parametrize("algo_name", PARTIAL_ALGORITHM_NAMES)
+@pytest.mark.parametrize("backend", BUFFER_FACTORIES)
+def test_partial_operations_on_buffers(algo_name, backend):
+    make = BUFFER_FACTORIES[backend]
+    values = [random.Random(6).randint(-500, 500) for _ in range(150)]
+    buffer = make(values)
+    assert run_partial(algo_name, False, buffer, k=40) is buffer
+    check_partial(algo_name, list(buffer), list(make(values)), 40)
+
+@pytest.mark.parametrize("use_yield", [True, False])
+def test_nth_element_median_of_medians_fallback(monkeypatch, use_yield):
+    # With no partition budget every pivot comes from the median of medians
+    monkeypatch.setattr(sortAlgorithms, "_partition_budget", lambda size: 0)
+    rng = random.Random(10)
+    for data in [list(range(300)), [rng.randrange(3) for _ in range(300)], rng.sample(range(1000), 301)]:
+        for k in (0, 150, len(data) - 1):
+            check_partial("Nth Element", run_partial("Nth Element", use_yield, list(data), k=k), data, k)
+
+def test_select_value_matches_sorted():
+    rng = random.Random(11)
+    for n in range(1, 80):
+        values = [rng.randrange(25) for _ in range(n)]
+        assert [sortAlgorithms._select_value(list(values), k) for k in range(n)] == sorted(values)
+
+def mixed_batch(seed=13):
+    rng = random.Random(seed)
+    arrays = [[rng.randint(-50, 50) for _ in range(rng.randint(0, 100))] for _ in range(400)]
+    arrays += [[rng.random() for _ in range(24)] for _ in range(40)]
+    arrays += [[rng.choice([1, 2.5, -3, 0.0]) for _ in range(20)] for _ in range(20)]
+    arrays += [[rng.choice("abcdef") for _ in range(16)] for _ in range(20)]
+    arrays += [[2 ** 70 + rng.randrange(9) for _ in range(32)] for _ in range(20)]
+    arrays += [array("i", [rng.randint(-9, 9) for _ in range(40)]) for _ in range(20)]
+    return arrays
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_sort_batch_small_n_paths(monkeypatch, with_numpy):
+    if with_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(sortAlgorithms, "_numpy", lambda: None)
+    arrays = mixed_batch()
+    expected = [sorted(arr) for arr in arrays]
+    originals = list(arrays)
+    assert sort_batch(arrays) is arrays
+    assert all(arr is original for arr, original in zip(arrays, originals))
+    assert [list(arr) for arr in arrays] == expected
+    # Values keep their types
+    assert [sorted(map(repr, arr)) for arr in arrays] == [sorted(map(repr, arr)) for arr in expected]
+
+def test_sort_batch_keeps_values_around_nan():
+    pytest.importorskip("numpy")
+    rng = random.Random(16)
+    arrays = [[rng.random() for _ in range(16)] for _ in range(16)]
+    arrays[5][9] = float("nan")
+    originals = [sorted(map(repr, arr)) for arr in arrays]
+    sort_batch(arrays)
+    assert [sorted(map(repr, arr)) for arr in arrays] == originals
+
+@pytest.mark.parametrize("algo_name", ALGORITHM_NAMES)
+def test_sort_batch_with_named_algorithm(algo_name):
+    arrays = [arr for arr in mixed_batch(14) if len(arr) <= 40]
+    expected = [sorted(arr) for arr in arrays]
+    sort_batch(arrays, algo_name)
+    assert [list(arr) for arr in arrays] == expected
+
+def test_sort_batch_key_reverse_and_processes():
+    rng = random.Random(15)
+    arrays = [[rng.randint(0, 99) for _ in range(rng.randint(0, 64))] for _ in range(300)]
+    sort_batch(arrays, key=lambda value: value % 10, reverse=True)
+    assert arrays == [sorted(arr, key=lambda value: value % 10, reverse=True) for arr in arrays]
+    expected = [sorted(arr) for arr in arrays]
+    sort_batch(arrays, processes=2)
+    assert arrays == expected
+
+def test_sort_batch_processes_pass_key_and_reverse():
+    rng = random.Random(17)
+    arrays = [[rng.randint(-99, 99) for _ in range(rng.randint(0, 40))] for _ in range(40)]
+    expected = [sorted(arr, reverse=True) for arr in arrays]
+    sort_batch(arrays, processes=2, reverse=True)
+    assert arrays == expected
+    expected = [sorted(arr, key=abs) for arr in arrays]
+    sort_batch(arrays, "Merge Sort", processes=2, key=abs)
+    assert arrays == expected
+    with pytest.raises(ValueError, match="picklable"):
+        sort_batch(arrays, processes=2, key=lambda value: -value)
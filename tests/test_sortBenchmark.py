@@ -0,0 +1,122 @@
+import pytest
+
+import sortBenchmark
+from sortBenchmark import (
+    NETWORK_ALGORITHMS, benchmark_function, dataset_series, make_job_spec, merge_shards, normalize_host, predict_runtime,
+    run_batch_benchmark, run_network_benchmark, run_partial_benchmark, run_shard, run_sharded_locally, run_sweep, shard_units,
+    spec_id, spec_units
+)
+
+def small_spec(**kwargs):
+    options = dict(distributions=("random", "few_unique"), trials=2, seed=3)
+    options.update(kwargs)
+    return make_job_spec(["Insertion Sort", "Merge Sort", "Heap Sort"], [0, 20, 40, 60], **options)
+
+def cells(dataset):
+    return sorted((row["algorithm"], row["distribution"], row["trial"], row["size"]) for row in dataset["results"])
+
+def test_predict_runtime_follows_power_law():
+    sizes = [100, 200, 400]
+    runtimes = [1.0, 4.0, 16.0]
+    assert predict_runtime(sizes, runtimes, 800) == pytest.approx(64.0)
+    assert predict_runtime([100], [1.0], 200) is None
+
+def test_sweep_truncates_slow_algorithms():
+    sizes = list(range(100, 2001, 100))
+    runtimes_dict, truncated_dict = run_sweep(["Bubble Sort", "Merge Sort"], sizes, time_budget_ms=1)
+    assert truncated_dict["Bubble Sort"] is not None
+    assert len(runtimes_dict["Bubble Sort"]) < len(sizes)
+    assert sizes[len(runtimes_dict["Bubble Sort"]) - 1] == truncated_dict["Bubble Sort"]
+
+def test_shards_partition_the_units():
+    spec = small_spec()
+    units = spec_units(spec)
+    sharded = [unit for index in range(4) for unit in shard_units(spec, index, 4)]
+    assert sorted(map(str, sharded)) == sorted(map(str, units))
+    with pytest.raises(ValueError):
+        shard_units(spec, 4, 4)
+
+def test_local_sharded_run_matches_single_shard():
+    spec = small_spec()
+    merged = run_sharded_locally(spec, shard_count=3, processes=2)
+    single = merge_shards([run_shard(spec)])
+    assert cells(merged) == cells(single)
+    assert len(merged["hosts"]) == 1
+    assert {row["host"] for row in merged["results"]} == {0}
+
+def test_merge_rejects_bad_shard_sets():
+    spec = small_spec()
+    shards = [run_shard(spec, index, 2) for index in range(2)]
+    with pytest.raises(ValueError, match="Missing shards"):
+        merge_shards(shards[:1])
+    with pytest.raises(ValueError, match="more than once"):
+        merge_shards([shards[0], shards[0], shards[1]])
+    other = run_shard(small_spec(seed=4), 1, 2)
+    with pytest.raises(ValueError, match="different job specs"):
+        merge_shards([shards[0], other])
+
+def test_merge_normalizes_hosts():
+    spec = small_spec(trials=1)
+    shards = [run_shard(spec, index, 2) for index in range(2)]
+    shards[0]["host"] = {"hostname": "Node1.example.org", "system": "Windows", "machine": "AMD64", "python": "CPython  3.11.7", "cpu_count": 8}
+    shards[1]["host"] = {"hostname": "node1", "system": "windows", "machine": "x86_64", "python": "CPython 3.11.7", "cpu_count": "8"}
+    merged = merge_shards(shards)
+    assert merged["hosts"] == [normalize_host(shards[1]["host"])]
+    assert merged["hosts"][0]["machine"] == "x86_64"
+
+def test_dataset_series_for_chart():
+    spec = small_spec()
+    sizes, runtimes_dict, names, truncated_dict = dataset_series(merge_shards([run_shard(spec)]))
+    assert sizes == spec["sizes"]
+    assert names[0] == "Insertion Sort (random)"
+    assert all(len(runtimes_dict[name]) == len(sizes) for name in names)
+    assert all(truncated_dict[name] is None for name in names)
+
+def test_network_benchmark_reports_throughput():
+    rows = run_network_benchmark([300], sequential_names=["Quick Sort"])
+    assert [row["algorithm"] for row in rows] == list(NETWORK_ALGORITHMS) + ["Quick Sort"]
+    assert all(row["python"] > 0 for row in rows)
+    assert rows[-1]["vectorized"] is None
+
+def test_k_fraction_sets_k_for_partial_operations():
+    arr = list(range(100, 0, -1))
+    benchmark_function("Partial Sort", 0.05)(arr)
+    assert arr[:5] == [1, 2, 3, 4, 5] and arr[5:] != list(range(6, 101))
+    arr = list(range(100, 0, -1))
+    assert benchmark_function("Quick Sort", 0.05)(arr) == list(range(1, 101))
+    runtimes_dict, truncated_dict = run_sweep(["Top-K", "Nth Element"], [0, 50, 100], k_fraction=0.2)
+    assert all(len(runtimes) == 3 for runtimes in runtimes_dict.values())
+
+def test_partial_benchmark_has_one_runtime_per_fraction():
+    runtimes_dict, full_sort_dict = run_partial_benchmark(500, fractions=[0.01, 0.5, 1.0], full_sort_names=["Quick Sort"])
+    assert set(runtimes_dict) == {"Partial Sort", "Top-K", "Nth Element"}
+    assert all(len(runtimes) == 3 for runtimes in runtimes_dict.values())
+    assert list(full_sort_dict) == ["Quick Sort"]
+
+def test_batch_benchmark_rows():
+    rows = run_batch_benchmark([8, 20], count=50, algorithm_names=["Insertion Sort"])
+    modes = [(row["algorithm"], row["mode"]) for row in rows if row["size"] == 8]
+    assert modes == [
+        ("Insertion Sort", "per call"), ("Insertion Sort", "batch"), ("Small-n paths", "batch"), ("list.sort", "per call")
+    ]
+    assert all(row["arrays_per_second"] > 0 for row in rows)
+
+def test_shard_progress_counts_every_cell():
+    spec = make_job_spec(["Bubble Sort", "Merge Sort"], list(range(100, 2001, 100)), time_budget_ms=1)
+    calls = []
+    run_shard(spec, progress=lambda done, total: calls.append((done, total)))
+    assert calls[-1] == (40, 40)
+    assert [done for done, _ in calls] == sorted(set(done for done, _ in calls))
+
+def test_job_spec_rejects_unknown_algorithms():
+    with pytest.raises(ValueError, match="Unknown algorithms"):
+        make_job_spec(["Merge Sort", "Sleep Sort"], [10])
+
+def test_job_spec_k_fraction_sets_k_and_spec_id(monkeypatch):
+    spec = make_job_spec(["Top-K"], [100], k_fraction=0.5)
+    assert spec_id(spec) != spec_id(make_job_spec(["Top-K"], [100]))
+    calls = []
+    original = sortBenchmark.benchmark_function
+    monkeypatch.setattr(sortBenchmark, "benchmark_function", lambda *args: calls.append(args) or original(*args))
+    run_shard(spec)
+    assert calls == [("Top-K", 0.5)]
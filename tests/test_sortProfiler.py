@@ -0,0 +1,87 @@
+import sys
+
+import pytest
+
+import sortAlgorithms
+import sortProfiler
+from sortBenchmark import series_target
+from sortProfiler import format_profile, module_code_objects, profile_algorithm, run_profiled, tracer_name
+
+def test_code_objects_include_nested_and_wrapped_functions():
+    names = {code.co_qualname for code in module_code_objects(sortAlgorithms)}
+    assert "merge_sort_no_yield" in names
+    assert "merge_sort_no_yield.<locals>.merge_sort_rec" in names
+    assert "keyed_sort.<locals>.wrapper" in names
+    assert "InversionCounter.update" in names
+
+def test_profile_counts_lines_of_sortAlgorithms_only():
+    report = profile_algorithm("Insertion Sort", 200)
+    assert report["tracer"] == tracer_name()
+    assert report["events"] == sum(row["hits"] for row in report["lines"])
+    assert {row["function"] for row in report["lines"]} == {"insertion_sort_no_yield", "keyed_sort.<locals>.wrapper"}
+    # The outer loop header runs once per element plus once to finish
+    loop = next(row for row in report["lines"] if row["source"].startswith("for i in range"))
+    assert loop["hits"] == 200
+    times = [row["time_ms"] for row in report["lines"]]
+    assert times == sorted(times, reverse=True)
+    assert all(0 <= row["adjusted_ms"] <= row["time_ms"] for row in report["lines"])
+
+def test_profile_hit_counts_are_deterministic():
+    first = profile_algorithm("Quick Sort", 300, "few_unique")
+    second = profile_algorithm("Quick Sort", 300, "few_unique")
+    hits = lambda report: sorted((row["function"], row["line"], row["hits"]) for row in report["lines"])
+    assert hits(first) == hits(second)
+
+def test_profile_follows_generators_and_recursion():
+    arr = [5, 3, 8, 1, 9, 2]
+    timer, _ = run_profiled(lambda: list(sortAlgorithms.merge_sort_recursive(arr)))
+    assert arr == [1, 2, 3, 5, 8, 9]
+    assert timer.stack == []
+    assert {code.co_name for code, _ in timer.hits} == {"merge_sort_recursive", "merge_sort_rec", "merge"}
+
+def test_profiler_is_removed_after_an_error():
+    previous = sys.gettrace()
+
+    def fail():
+        sortAlgorithms.quick_sort_no_yield([3, None, 1])
+
+    with pytest.raises(TypeError):
+        run_profiled(fail)
+    assert sys.gettrace() is previous
+    # The monitoring tool id was released, so profiling works again
+    timer, _ = run_profiled(lambda: sortAlgorithms.insertion_sort_no_yield([2, 1]))
+    assert timer.hits
+
+monitoring_only = pytest.mark.skipif(sys.version_info < (3, 12), reason="sys.monitoring is new in Python 3.12")
+
+@monitoring_only
+def test_monitoring_counts_the_same_lines_as_settrace(monkeypatch):
+    arr = list(range(50, 0, -1))
+    timer, _ = run_profiled(lambda: sortAlgorithms.insertion_sort_no_yield(list(arr)))
+    assert timer.tracer == "sys.monitoring"
+    monkeypatch.setattr(sortProfiler, "tracer_name", lambda: "sys.settrace")
+    traced, _ = run_profiled(lambda: sortAlgorithms.insertion_sort_no_yield(list(arr)))
+    assert traced.tracer == "sys.settrace"
+    assert timer.hits == traced.hits
+
+@monitoring_only
+def test_monitoring_falls_back_when_the_tool_id_is_taken():
+    monitoring = sys.monitoring
+    monitoring.use_tool_id(monitoring.PROFILER_ID, "other profiler")
+    try:
+        report = profile_algorithm("Insertion Sort", 100)
+    finally:
+        monitoring.free_tool_id(monitoring.PROFILER_ID)
+    assert report["tracer"] == "sys.settrace"
+    assert report["events"] > 0
+
+def test_format_profile_lists_top_lines():
+    text = format_profile(profile_algorithm("Heap Sort", 200), top=3)
+    assert text.splitlines()[0].startswith("Heap Sort, n=200 (random)")
+    assert "profiler overhead" in text
+    assert len(text.splitlines()) == 5 + 3
+
+def test_series_target():
+    assert series_target("Merge Sort") == ("Merge Sort", "random")
+    assert series_target("Merge Sort (few_unique)") == ("Merge Sort", "few_unique")
+    assert series_target("Odd-Even Merge Sort") == ("Odd-Even Merge Sort", "random")
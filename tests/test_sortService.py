@@ -0,0 +1,120 @@
+import csv
+import io
+import time
+
+import pytest
+
+from sortService import JobQueue, ServiceClient, ServiceError, SortService
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite")
+
+def start_service(db_path, workers=1):
+    return SortService(db_path, workers=workers, port=0, poll_interval=0.05).start()
+
+def test_job_runs_and_serves_json_and_csv(db_path):
+    with start_service(db_path) as service:
+        client = ServiceClient(service.url)
+        assert "Merge Sort" in client.request("GET", "/algorithms")["algorithms"]
+        job = client.submit(["Insertion Sort", "Merge Sort"], [10, 20, 30], ("random", "few_unique"), seed=4)
+        assert job["status"] == "queued"
+        job = client.wait(job["id"])
+        assert job["status"] == "done"
+        assert job["progress"] == 1.0
+
+        dataset = client.results(job["id"])
+        assert len(dataset["results"]) == 2 * 2 * 3
+        rows = list(csv.DictReader(io.StringIO(client.results_csv(job["id"]))))
+        assert len(rows) == len(dataset["results"])
+        assert rows[0].keys() == {"algorithm", "distribution", "trial", "size", "runtime_ms", "truncated"}
+        assert [job["id"] for job in client.jobs()] == [job["id"]]
+
+def test_queued_job_is_cancelled_at_once(db_path):
+    with start_service(db_path, workers=0) as service:
+        client = ServiceClient(service.url)
+        job = client.submit(["Merge Sort"], [10])
+        assert client.cancel(job["id"])["status"] == "cancelled"
+        with pytest.raises(ServiceError) as error:
+            client.results(job["id"])
+        assert error.value.status == 409
+
+def test_running_job_stops_when_cancelled(db_path):
+    with start_service(db_path) as service:
+        client = ServiceClient(service.url)
+        job = client.submit(["Bubble Sort"], list(range(500, 100001, 500)))
+        while client.job(job["id"])["cells_done"] == 0:
+            time.sleep(0.01)
+        assert client.cancel(job["id"])["cancel_requested"]
+        job = client.wait(job["id"], timeout=30)
+        assert job["status"] == "cancelled"
+        assert job["progress"] < 1.0
+
+def test_stop_requeues_running_job_between_cells(db_path):
+    service = start_service(db_path)
+    client = ServiceClient(service.url)
+    job = client.submit(["Bubble Sort"], list(range(500, 100001, 500)))
+    while client.job(job["id"])["cells_done"] == 0:
+        time.sleep(0.01)
+    worker = service.workers[0]
+    service.stop(timeout=30)
+    # The worker left on its own rather than being terminated
+    assert worker.exitcode == 0
+    queue = JobQueue(db_path)
+    job = queue.job(job["id"])
+    queue.close()
+    assert job["status"] == "queued"
+    assert job["cells_done"] == 0
+
+def test_queue_survives_restart(db_path):
+    with start_service(db_path, workers=0) as service:
+        job = ServiceClient(service.url).submit(["Heap Sort"], [10, 20])
+    # A job some worker was running when the service stopped goes back in the queue
+    queue = JobQueue(db_path)
+    assert queue.claim("lost-worker")[0] == job["id"]
+    queue.close()
+    with start_service(db_path) as service:
+        assert ServiceClient(service.url).wait(job["id"])["status"] == "done"
+
+def test_claim_hands_each_job_out_once(db_path):
+    queue = JobQueue(db_path)
+    first = queue.submit({"sizes": [1]}, 1)
+    second = queue.submit({"sizes": [1]}, 1)
+    assert queue.claim("a")[0] == first
+    assert queue.claim("b")[0] == second
+    assert queue.claim("c") is None
+    queue.close()
+
+@pytest.mark.parametrize("body, message", [
+    ({"algorithms": ["Sleep Sort"], "sizes": [10]}, "Unknown algorithms"),
+    ({"algorithms": ["Merge Sort"]}, "sizes or max_size"),
+    ({"algorithms": ["Merge Sort"], "sizes": [10], "distributions": ["zigzag"]}, "Unknown distributions"),
+    ({"algorithms": ["Merge Sort"], "sizes": [10], "trials": 0}, "trials"),
+    ({"algorithms": ["Top-K"], "sizes": [10], "k_fraction": 2}, "k_fraction"),
+    ([], "JSON object"),
+])
+def test_bad_requests_are_rejected(db_path, body, message):
+    with start_service(db_path, workers=0) as service:
+        with pytest.raises(ServiceError) as error:
+            ServiceClient(service.url).request("POST", "/jobs", body)
+        assert error.value.status == 400
+        assert message in error.value.message
+
+def test_unknown_jobs_and_paths_are_404(db_path):
+    with start_service(db_path, workers=0) as service:
+        client = ServiceClient(service.url)
+        for call in (lambda: client.job(7), lambda: client.cancel(7), lambda: client.request("GET", "/nothing")):
+            with pytest.raises(ServiceError) as error:
+                call()
+            assert error.value.status == 404
+
+def test_max_size_and_step_size_give_sizes(db_path):
+    with start_service(db_path, workers=0) as service:
+        job = ServiceClient(service.url).request("POST", "/jobs", {"algorithms": ["Merge Sort"], "max_size": 50, "step_size": 25})
+        assert job["spec"]["sizes"] == [25, 50]
+        assert job["cells_total"] == 2
+
+def test_k_fraction_is_part_of_the_job_spec(db_path):
+    with start_service(db_path, workers=0) as service:
+        job = ServiceClient(service.url).submit(["Top-K", "Nth Element"], [10], k_fraction=0.25)
+        assert job["spec"]["k_fraction"] == 0.25